@@ -0,0 +1,57 @@
+'''
+Benchmark html size and write time of every weekly figure, plotly's default
+json versus fig_json.py (typed arrays for dates and narrowed numbers, orjson),
+and check that the decoded data of every figure is identical. Weeks whose
+script cannot run here (missing data or packages) are listed and skipped.
+
+    python benchmark_json.py
+    python benchmark_json.py Week_41_NYC_Transit Week_49_New_England
+'''
+import sys
+import time
+
+import polars as pl
+
+from fig_json import check_round_trip, to_html_fast
+from week_runner import collect_figures, week_scripts
+
+# constants
+REPEATS = 5   # html of each figure is written this many times, best time kept
+
+def best_time(func, fig):
+    ''' html of fig and best seconds of REPEATS runs '''
+    seconds = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        html = func(fig)
+        seconds.append(time.perf_counter() - start)
+    return html, min(seconds)
+
+weeks = sys.argv[1:] or list(week_scripts)
+rows, skipped = [], []
+for week in weeks:
+    try:
+        figs = collect_figures(week)
+    except Exception as err:
+        skipped.append(f'{week}: {type(err).__name__}')
+        continue
+    for i, fig in enumerate(figs):
+        html_default, sec_default = best_time(
+            lambda f: f.to_html(include_plotlyjs=False, full_html=False), fig)
+        html_fast, sec_fast = best_time(
+            lambda f: to_html_fast(f, include_plotlyjs=False, full_html=False), fig)
+        rows.append(
+            {
+                'WEEK'        : week,
+                'FIG'         : i + 1,
+                'DEFAULT_KB'  : round(len(html_default.encode()) / 1024, 1),
+                'FAST_KB'     : round(len(html_fast.encode()) / 1024, 1),
+                'DEFAULT_MS'  : round(1000 * sec_default, 1),
+                'FAST_MS'     : round(1000 * sec_fast, 1),
+                'ROUND_TRIP'  : 'ok' if not check_round_trip(fig) else 'FAILED',
+            }
+        )
+with pl.Config(tbl_rows=100):
+    print(pl.DataFrame(rows))
+for line in skipped:
+    print('skipped', line)
@@ -0,0 +1,62 @@
+'''
+Benchmark csv parsing of every weekly data set found on disk, with inferred
+types versus the declared schemas of dataset_schemas.py. Inferred is plain
+pl.read_csv, types guessed from the first 100 rows, and full inference reads
+the whole file to guess, as needed when late rows break the guess. Best of
+REPEATS runs, with the size of the resulting dataframe.
+'''
+import time
+
+import polars as pl
+
+from dataset_schemas import dataset_path, datasets, scan_dataset
+
+# constants
+REPEATS = 5
+
+def best_seconds(read):
+    ''' fastest of REPEATS calls of read, and the last dataframe '''
+    seconds = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        df = read()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), df
+
+def readers(name):
+    ''' label and read function of each way to parse a data set '''
+    path = dataset_path(name)
+    scan_options = dict(null_values=datasets[name].get('null_values'), glob=True)
+    return [
+        ('inferred', lambda: pl.scan_csv(path, **scan_options).collect()),
+        ('full inference',
+            lambda: pl.scan_csv(path, infer_schema_length=None, **scan_options).collect()),
+        ('declared', lambda: scan_dataset(name).collect()),
+    ]
+
+#------------------------------------------------------------------------------#
+#     run the benchmark, print a table                                         #
+#------------------------------------------------------------------------------#
+rows = []
+for name in datasets:
+    path = dataset_path(name)
+    if not any(path.parent.glob(path.name)):
+        print(f'{name}: skipped, no file {path}')
+        continue
+    for label, read in readers(name):
+        try:
+            seconds, df = best_seconds(read)
+        except pl.exceptions.ComputeError as err:   # guessed types broke on a late row
+            print(f'{name} {label}: {str(err).splitlines()[0]}')
+            continue
+        rows.append(
+            {
+                'DATASET' : name,
+                'METHOD'  : label,
+                'ROWS'    : df.height,
+                'MS'      : round(seconds * 1000, 1),
+                'MB'      : round(df.estimated_size('mb'), 2),
+            }
+        )
+with pl.Config(tbl_rows=-1):
+    print(pl.DataFrame(rows))
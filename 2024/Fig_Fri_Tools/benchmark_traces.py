@@ -0,0 +1,118 @@
+'''
+Benchmark the conversion of data into plotly trace arrays.
+
+Per weekly figure: every array a trace gets goes through plotly's
+copy_to_readonly_numpy_array, which is timed here, with a count of what it
+was given: numpy arrays (as from frame_traces.py), polars / narwhals data, or
+python lists and tuples, which numpy converts one element at a time.
+
+Then px.line of wide data, the week 41 and 49 charts, against line_figure of
+frame_traces.py, for a growing number of rows. Best of REPEATS runs.
+'''
+import time
+
+import numpy as np
+import polars as pl
+import plotly.express as px
+import _plotly_utils.basevalidators as bv
+
+from frame_traces import line_figure
+from week_runner import collect_figures, week_scripts
+
+# constants
+REPEATS = 3
+ROWS = [1_000, 10_000, 100_000]
+Y_COLS = ['2024', '2023', '2022', '2021', '2020']
+
+#------------------------------------------------------------------------------#
+#     conversion per weekly figure                                             #
+#------------------------------------------------------------------------------#
+def input_kind(value):
+    ''' numpy, list or polars, what a trace attribute was given '''
+    if isinstance(value, np.ndarray):
+        return 'numpy'
+    if isinstance(value, (list, tuple)):
+        return 'list'
+    return 'polars'
+
+def conversion_by_figure(weeks):
+    ''' dataframe of arrays converted and ms taken for every figure shown '''
+    copy_array = bv.copy_to_readonly_numpy_array
+    counts = {'numpy': 0, 'list': 0, 'polars': 0, 'seconds': 0.0}
+
+    def timed_copy(v, *args, **kwargs):
+        start = time.perf_counter()
+        result = copy_array(v, *args, **kwargs)
+        counts['seconds'] += time.perf_counter() - start
+        counts[input_kind(v)] += 1
+        return result
+
+    rows = []
+
+    def on_show(fig):
+        rows.append(
+            {
+                'FIGURE'      : f'{week}/{len(rows) - first_row + 1}',
+                'TRACES'      : len(fig.data),
+                'FROM_NUMPY'  : counts['numpy'],
+                'FROM_POLARS' : counts['polars'],
+                'FROM_LISTS'  : counts['list'],
+                'CONVERT_MS'  : round(counts['seconds'] * 1000, 2),
+            }
+        )
+        counts.update({'numpy': 0, 'list': 0, 'polars': 0, 'seconds': 0.0})
+
+    bv.copy_to_readonly_numpy_array = timed_copy
+    try:
+        for week in weeks:
+            first_row = len(rows)
+            counts.update({'numpy': 0, 'list': 0, 'polars': 0, 'seconds': 0.0})
+            try:
+                collect_figures(week, on_show=on_show)
+            except Exception as err:   # missing data or packages
+                print(f'{week}: skipped, {type(err).__name__}: {err}')
+    finally:
+        bv.copy_to_readonly_numpy_array = copy_array
+    return pl.DataFrame(rows)
+
+#------------------------------------------------------------------------------#
+#     px.line against line_figure                                              #
+#------------------------------------------------------------------------------#
+def wide_frame(n_rows):
+    ''' DATE and one column per year, like the week 41 subway pivot '''
+    rng = np.random.default_rng(41)
+    return pl.DataFrame(
+        {'DATE': pl.datetime_range(
+            pl.datetime(2020, 1, 1), pl.datetime(2020, 1, 1) + pl.duration(hours=n_rows - 1),
+            '1h', eager=True)}
+        | {col: rng.random(n_rows) for col in Y_COLS}
+    )
+
+def best_ms(build):
+    ''' fastest of REPEATS builds, in ms '''
+    seconds = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        build()
+        seconds.append(time.perf_counter() - start)
+    return round(min(seconds) * 1000, 1)
+
+def line_chart_times():
+    ''' ms per wide line chart, px.line against line_figure '''
+    rows = []
+    for n_rows in ROWS:
+        df = wide_frame(n_rows)
+        opts = dict(template='simple_white', height=600, width=900)
+        rows.append(
+            {
+                'ROWS'           : n_rows,
+                'PX_LINE_MS'     : best_ms(lambda: px.line(df, 'DATE', Y_COLS, **opts)),
+                'LINE_FIGURE_MS' : best_ms(lambda: line_figure(df, 'DATE', Y_COLS, **opts)),
+            }
+        )
+    return pl.DataFrame(rows)
+
+if __name__ == '__main__':
+    with pl.Config(tbl_rows=-1):
+        print(conversion_by_figure(list(week_scripts)))
+        print(line_chart_times())
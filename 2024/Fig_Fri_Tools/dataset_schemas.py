@@ -0,0 +1,118 @@
+'''
+Declared polars schemas of the weekly data sets, csv files are read without
+type inference.
+
+Each data set lists the types of the columns the scripts compute with, every
+other column is read as a string, so polars never samples the file to guess
+types and the scripts need no casts to fix them afterwards. A value that does
+not fit its declared type is an error, not a silent null or a string column.
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))
+    from dataset_schemas import scan_dataset
+    df = scan_dataset('wine').collect()
+
+path is relative to the year folder, the default source of scan_dataset.
+'''
+from pathlib import Path
+
+import polars as pl
+
+# constants
+YEAR_DIR = Path(__file__).resolve().parent.parent
+datasets = {
+    'votes': dict(      # Eurovision votes, week 40
+        path='Week_40_Eurovision/votes.csv',
+        null_values='NA',
+        schema={
+            'year'              : pl.Int16,
+            'total_points'      : pl.Int16,
+            'televoting_points' : pl.Int16,
+            'jury_points'       : pl.Int16,
+        },
+    ),
+    'mta': dict(        # MTA daily ridership, week 41. Date is m/d/Y text
+        path='Week_41_NYC_Transit/MTA_Daily_Ridership_Data__Beginning_2020.csv',
+        schema={
+            'Subways: Total Estimated Ridership'                      : pl.Int32,
+            'Subways: % of Comparable Pre-Pandemic Day'               : pl.Float32,
+            'Buses: Total Estimated Ridership'                        : pl.Int32,
+            'Buses: % of Comparable Pre-Pandemic Day'                 : pl.Float32,
+            'LIRR: Total Estimated Ridership'                         : pl.Int32,
+            'LIRR: % of Comparable Pre-Pandemic Day'                  : pl.Float32,
+            'Metro-North: Total Estimated Ridership'                  : pl.Int32,
+            'Metro-North: % of Comparable Pre-Pandemic Day'           : pl.Float32,
+            'Access-A-Ride: Total Scheduled Trips'                    : pl.Int32,
+            'Access-A-Ride: % of Comparable Pre-Pandemic Day'         : pl.Float32,
+            'Bridges and Tunnels: Total Traffic'                      : pl.Int32,
+            'Bridges and Tunnels: % of Comparable Pre-Pandemic Day'   : pl.Float32,
+            'Staten Island Railway: Total Estimated Ridership'        : pl.Int32,
+            'Staten Island Railway: % of Comparable Pre-Pandemic Day' : pl.Float32,
+        },
+    ),
+    'snakes': dict(     # snake lengths and weights, week 42
+        path='Week_42_Snakes/merged_snake_data.csv',
+        schema={
+            'TBL cm'    : pl.Float64,
+            'Weight gr' : pl.Float64,
+            'DL mm'     : pl.Float64,
+        },
+    ),
+    'open_repair': dict(   # Open Repair Data Standard export, week 43
+        path='Week_43_Repairs/OpenRepair_Data_RepairCafeInt_202407.csv',
+        schema={
+            'product_age' : pl.Float32,   # years, written with decimals
+        },
+    ),
+    'mines': dict(      # closed Canadian coal mines, week 45, saved by the script
+        path='Week_45_Gantt/week_45_data.csv',
+        schema={
+            'latitude'    : pl.Float64,
+            'longitude'   : pl.Float64,
+            'YEAR_OPENED' : pl.Int16,
+            'YEAR_CLOSED' : pl.Int16,
+        },
+    ),
+    'wine': dict(       # PDO wines of France and Italy, week 46, saved by the script
+        path='Week_46_Wine/week_46_data.csv',
+        null_values={'Max_yield_kg': 'na', 'Min_density': 'na'},
+        schema={
+            'Max_yield_hl' : pl.UInt16,
+            'Max_yield_kg' : pl.UInt32,
+            'Min_density'  : pl.UInt16,
+        },
+    ),
+    'ufo': dict(        # NUFORC sightings, scrubbed.csv of week 47
+        path='Week_47_UFOs/scrubbed.csv',
+        scan_options=dict(ignore_errors=True),   # a few latitudes are mistyped
+        schema={
+            'duration (seconds)' : pl.Float32,
+            'latitude'           : pl.Float64,
+            'longitude '         : pl.Float64,   # trailing space is in the file
+        },
+    ),
+    'demand': dict(     # ISO-NE hourly demand, week 49, one file per year
+        path='Week_49_New_England/megawatt_demand_*.csv',
+        schema={
+            f'{zone} Actual Load (MW)': pl.Float32 for zone in [
+                'Connecticut', 'Maine', 'New Hampshire', 'Northeast Massachusetts',
+                'Rhode Island', 'Southeast Massachusetts', 'Vermont',
+                'Western/Central Massachusetts',
+            ]
+        },
+    ),
+}
+
+def dataset_path(name):
+    ''' full path or glob of a data set '''
+    return YEAR_DIR / datasets[name]['path']
+
+def scan_dataset(name, source=None, **kwargs):
+    ''' lazyframe of a data set with its declared schema, nothing inferred '''
+    spec = datasets[name]
+    return pl.scan_csv(
+        source or dataset_path(name),
+        schema_overrides=spec['schema'],
+        infer_schema=False,   # all other columns are strings
+        null_values=spec.get('null_values'),
+        **(spec.get('scan_options', {}) | kwargs),
+    )
@@ -0,0 +1,191 @@
+'''
+Compact figure json for html output: typed binary arrays and the orjson engine.
+
+plotly already sends numeric numpy arrays as base64 typed arrays, but dates go
+as text like '2024-01-01T00:00:00.000', ~30 bytes per point, and float64 data
+is always sent with 8 bytes per value. encode_figure changes, in the data of
+every trace and animation frame,
+
+    datetime64 x / y / base   ->  float64 ms since epoch, axis type set to date
+    float64, whole numbers    ->  the narrowest int type that holds them
+    float64, exact in float32 ->  float32
+    lists of numbers          ->  typed arrays like numpy arrays
+
+None of these change a value that plotly.js draws, check_round_trip compares
+the decoded arrays with the figure. customdata and text are left alone, the
+hover templates format them as they are. The json is written with orjson.
+
+    from fig_json import write_html_fast
+    write_html_fast(fig, 'Wines.html')
+'''
+import base64
+from contextlib import contextmanager
+
+import numpy as np
+import plotly.io as pio
+
+# constants
+JSON_ENGINE = 'orjson'
+DATE_KEYS = {'x', 'y', 'base'}   # keys on a date axis, base is on the bar axis
+MIN_LIST_SIZE = 16   # shorter lists are smaller as json text
+NUMERIC_KEYS = ['x', 'y', 'z', 'base', 'lat', 'lon', 'open', 'high', 'low',
+                'close', 'values', 'q1', 'median', 'q3', 'lowerfence', 'upperfence']
+INT_TYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+short_types = {   # numpy dtype: dtype name of a plotly.js typed array
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+numpy_types = {short: np.dtype(name) for name, short in short_types.items()}
+
+#------------------------------------------------------------------------------#
+#     arrays                                                                   #
+#------------------------------------------------------------------------------#
+def as_array(values):
+    ''' numpy array of values, None if not a 1d or 2d array of numbers/dates '''
+    if isinstance(values, (list, tuple)):
+        if len(values) < MIN_LIST_SIZE:
+            return None
+        try:
+            values = np.asarray(values)
+        except ValueError:   # ragged lists
+            return None
+    if not isinstance(values, np.ndarray) or values.size == 0:
+        return None
+    if values.dtype.kind not in 'iufM' or values.ndim > 2:
+        return None
+    return values
+
+def date_to_ms(values):
+    ''' datetime64 array as float64 ms since epoch, NaT becomes NaN '''
+    ms = values.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    ms[np.isnat(values)] = np.nan
+    return ms
+
+def narrow(values):
+    ''' smallest int / float type that holds exactly the same numbers '''
+    if values.dtype.kind in 'iu':
+        lo, hi = values.min(), values.max()
+    elif values.dtype == np.float64 and np.isfinite(values).all():
+        if np.array_equal(values, np.round(values)):
+            lo, hi = values.min(), values.max()
+        else:
+            lo = hi = None
+    else:
+        lo = hi = None
+    if lo is not None:
+        for int_type in INT_TYPES:
+            info = np.iinfo(int_type)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(int_type)
+    if values.dtype == np.float64:
+        as_32 = values.astype(np.float32)
+        if np.array_equal(as_32.astype(np.float64), values, equal_nan=True):
+            return as_32
+    return values
+
+def typed_array_spec(values):
+    ''' plotly.js typed array spec {'dtype', 'bdata', 'shape'} of a numpy array '''
+    short = short_types.get(str(values.dtype))
+    if short is None:   # int64 beyond int32, plotly's json writes it as a list
+        return values
+    spec = {
+        'dtype': short,
+        'bdata': base64.b64encode(np.ascontiguousarray(values)).decode('ascii'),
+    }
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
+
+def decode_array(spec):
+    ''' numpy array from a typed array spec {'dtype', 'bdata', 'shape'} '''
+    values = np.frombuffer(base64.b64decode(spec['bdata']), numpy_types[spec['dtype']])
+    if 'shape' in spec:
+        values = values.reshape([int(n) for n in spec['shape'].split(',')])
+    return values
+
+#------------------------------------------------------------------------------#
+#     figures                                                                  #
+#------------------------------------------------------------------------------#
+def date_axis(trace, key):
+    ''' layout axis name of a date key of a trace, like xaxis2 '''
+    if key == 'base':   # bars grow along x when horizontal, else along y
+        key = 'x' if trace.get('orientation') == 'h' else 'y'
+    ref = trace.get(f'{key}axis', key)
+    return f'{key}axis{ref[1:]}'
+
+def encode_traces(traces, layout):
+    ''' encode the arrays of a list of trace dicts, in place '''
+    for trace in traces:
+        for key in NUMERIC_KEYS:
+            values = as_array(trace.get(key))
+            if values is None:
+                continue
+            if values.dtype.kind == 'M':
+                axis = layout.setdefault(date_axis(trace, key), {}) if key in DATE_KEYS else {}
+                if axis.setdefault('type', 'date') != 'date':
+                    continue   # dates on a category axis stay text
+                values = date_to_ms(values)
+            trace[key] = typed_array_spec(narrow(values))
+
+def encode_figure(fig):
+    ''' figure dict with compact typed arrays, ready for json '''
+    fig_dict = fig.to_plotly_json()   # numpy arrays already typed arrays
+    layout = fig_dict.setdefault('layout', {})
+    encode_traces(fig_dict.get('data', []), layout)
+    for frame in fig_dict.get('frames', []):
+        encode_traces(frame.get('data', []), layout)
+    return fig_dict
+
+@contextmanager
+def json_engine(engine=JSON_ENGINE):
+    ''' plotly json engine for the duration of the block '''
+    old_engine = pio.json.config.default_engine
+    pio.json.config.default_engine = engine
+    try:
+        yield
+    finally:
+        pio.json.config.default_engine = old_engine
+
+def to_json_fast(fig):
+    ''' figure json with typed arrays, written by orjson '''
+    with json_engine():
+        return pio.to_json(encode_figure(fig), validate=False)
+
+def to_html_fast(fig, **kwargs):
+    ''' like fig.to_html, with typed arrays and orjson '''
+    with json_engine():
+        return pio.to_html(encode_figure(fig), validate=False, **kwargs)
+
+def write_html_fast(fig, file, **kwargs):
+    ''' like fig.write_html, with typed arrays and orjson '''
+    with json_engine():
+        return pio.write_html(encode_figure(fig), file, validate=False, **kwargs)
+
+#------------------------------------------------------------------------------#
+#     round trip check                                                         #
+#------------------------------------------------------------------------------#
+def check_round_trip(fig, fig_json=None):
+    ''' list of (trace, key) whose decoded values differ from the figure '''
+    import json
+
+    fig_json = fig_json or to_json_fast(fig)
+    decoded = json.loads(fig_json)
+    original = fig.to_plotly_json()
+    pairs = list(zip(original.get('data', []), decoded.get('data', [])))
+    for frame, frame_json in zip(original.get('frames', []), decoded.get('frames', [])):
+        pairs += list(zip(frame.get('data', []), frame_json.get('data', [])))
+
+    mismatches = []
+    for i, (trace, trace_json) in enumerate(pairs):
+        for key in NUMERIC_KEYS:
+            values = as_array(trace.get(key))
+            if values is None:
+                continue
+            spec = trace_json.get(key)
+            if values.dtype.kind == 'M' and not isinstance(spec, dict):
+                continue   # dates left as text
+            got = decode_array(spec) if isinstance(spec, dict) else np.asarray(spec, dtype=float)
+            want = date_to_ms(values) if values.dtype.kind == 'M' else values
+            if not np.array_equal(got.astype(np.float64), want.astype(np.float64), equal_nan=True):
+                mismatches.append((i, key))
+    return mismatches
@@ -0,0 +1,131 @@
+'''
+Shrink stage for finished dataframes: narrowest safe dtypes, with a memory report.
+
+shrink looks at the values of every column once and casts
+
+    Int64 / Int32 ...   ->  the narrowest int of the same signedness that holds them
+    Float64             ->  Float32, only if every value is exactly the same
+    String              ->  Categorical, if at most CATEGORY_RATIO of values and at
+                            most CATEGORY_MAX values are unique, and the codes and
+                            category strings take less memory than the strings
+
+then prints a before / after table of dtypes and estimated memory, the memory
+of a categorical column being its codes plus its category strings. Use it where
+a loader hands its frame over to the figures, after the last join, string edit
+or arithmetic: a categorical does not join with or edit like a string, and sums
+and products of narrow ints can overflow. Columns still used that way can be
+listed in exclude.
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))
+    from frame_shrink import shrink
+    df = shrink(df, 'wine')
+'''
+import polars as pl
+
+# constants
+CATEGORY_RATIO = 0.05   # strings with more unique values stay strings
+CATEGORY_MAX = 256      # and so do strings with more unique values than this
+SIGNED_TYPES = [pl.Int8, pl.Int16, pl.Int32, pl.Int64]
+UNSIGNED_TYPES = [pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64]
+int_ranges = {   # lowest and highest value of each int type
+    **{t: (-2**(bits - 1), 2**(bits - 1) - 1) for t, bits in zip(SIGNED_TYPES, [8, 16, 32, 64])},
+    **{t: (0, 2**bits - 1) for t, bits in zip(UNSIGNED_TYPES, [8, 16, 32, 64])},
+}
+
+#------------------------------------------------------------------------------#
+#     pick dtypes                                                              #
+#------------------------------------------------------------------------------#
+def narrow_int(dtype, lo, hi):
+    ''' narrowest int type of the same signedness holding lo to hi '''
+    int_types = UNSIGNED_TYPES if dtype.is_unsigned_integer() else SIGNED_TYPES
+    for int_type in int_types[:int_types.index(dtype)]:
+        int_min, int_max = int_ranges[int_type]
+        if int_min <= lo and hi <= int_max:
+            return int_type
+    return dtype
+
+def shrink_plan(df, exclude=(), category_ratio=CATEGORY_RATIO, category_max=CATEGORY_MAX):
+    ''' dict of column: narrower dtype, from one pass of column statistics '''
+    stats = []
+    for name, dtype in df.schema.items():
+        if name in exclude:
+            continue
+        col = pl.col(name)
+        if dtype.is_integer():
+            stats += [col.min().alias(f'{name}:min'), col.max().alias(f'{name}:max')]
+        elif dtype == pl.Float64:
+            exact = col.cast(pl.Float32).cast(pl.Float64).eq_missing(col).all()
+            stats.append(exact.alias(f'{name}:exact'))
+        elif dtype == pl.String:
+            stats.append(col.n_unique().alias(f'{name}:unique'))
+    if not stats or df.is_empty():
+        return {}
+    values = df.select(stats).row(0, named=True)
+
+    plan = {}
+    for name, dtype in df.schema.items():
+        if f'{name}:min' in values and values[f'{name}:min'] is not None:
+            new_type = narrow_int(dtype, values[f'{name}:min'], values[f'{name}:max'])
+            if new_type != dtype:
+                plan[name] = new_type
+        elif values.get(f'{name}:exact'):
+            plan[name] = pl.Float32
+        elif values.get(f'{name}:unique', df.height + 1) <= min(
+                category_ratio * df.height, category_max):
+            plan[name] = pl.Categorical
+    return plan
+
+#------------------------------------------------------------------------------#
+#     shrink and report                                                        #
+#------------------------------------------------------------------------------#
+def column_size(series, unit='b'):
+    ''' estimated size of a column, codes plus category strings of a categorical '''
+    size = series.estimated_size(unit)
+    if series.dtype == pl.Categorical:   # estimated_size counts only the codes
+        size += series.unique().cast(pl.String).estimated_size(unit)
+    return size
+
+def frame_size(df, unit='b'):
+    ''' estimated size of a frame, sum of column_size '''
+    return sum(column_size(series, unit) for series in df)
+
+def memory_table(df_before, df_after):
+    ''' dtype and estimated KB of every column, before and after '''
+    return pl.DataFrame(
+        {
+            'COLUMN'    : df_before.columns,
+            'BEFORE'    : [str(dtype) for dtype in df_before.dtypes],
+            'AFTER'     : [str(dtype) for dtype in df_after.dtypes],
+            'KB_BEFORE' : [round(column_size(s, 'kb'), 1) for s in df_before],
+            'KB_AFTER'  : [round(column_size(s, 'kb'), 1) for s in df_after],
+        }
+    )
+
+def print_report(name, df_before, df_after):
+    ''' one line with the totals, then the table of changed columns '''
+    kb_before = frame_size(df_before, 'kb')
+    kb_after = frame_size(df_after, 'kb')
+    saved = 100 * (1 - kb_after / kb_before) if kb_before else 0.0
+    print(f'{name}: {df_before.height:,} rows, '
+          f'{kb_before:,.1f} KB -> {kb_after:,.1f} KB, {saved:.0f}% less')
+    df_changed = memory_table(df_before, df_after).filter(pl.col('BEFORE') != pl.col('AFTER'))
+    if not df_changed.is_empty():
+        with pl.Config(tbl_rows=-1, tbl_hide_dataframe_shape=True):
+            print(df_changed)
+
+def shrink(
+        df,
+        name='dataframe',
+        exclude=(),
+        report=True,
+        category_ratio=CATEGORY_RATIO,
+        category_max=CATEGORY_MAX,
+        ):
+    ''' df with the narrowest safe dtypes, prints a memory report '''
+    df_shrunk = df.cast(shrink_plan(df, exclude, category_ratio, category_max))
+    # short strings can take less memory than category codes and strings, keep those
+    grown = [c for c in df.columns if column_size(df_shrunk[c]) > column_size(df[c])]
+    df_shrunk = df_shrunk.with_columns(df.select(grown))
+    if report:
+        print_report(name, df, df_shrunk)
+    return df_shrunk
@@ -0,0 +1,72 @@
+'''
+Polars columns straight into plotly traces, as numpy views of their buffers.
+
+px.line with a list of y columns first unpivots the frame to long form, one
+row per point and column, with the x values and column names repeated, then
+splits it again into one trace per column. Passing a polars Series or frame
+to a trace goes through narwhals and to_numpy for every attribute. Here each
+column is handed to the trace as the numpy array polars gives without a copy,
+numbers and dates without nulls are views of the arrow buffer, so plotly's own
+read-only copy is the only one. Strings are object arrays, never lists.
+
+    line_figure(df, 'DATE', ['2024', '2023'], template='simple_white')
+    go.Bar(**trace_columns(df, x='TBL cm', y='Common Name'))
+
+line_figure makes the same figure as px.line for wide (list of y) and long
+(color) data: px.line itself builds it from the first row of every trace, so
+colors, hover templates, legend and axis titles follow plotly, then the full
+columns go into the traces. Only the switch to scattergl above WEBGL_POINTS
+points is decided here, test_frame_traces.py checks it against px.line.
+'''
+import numpy as np
+import plotly.express as px
+import polars as pl
+
+# constants
+WEBGL_POINTS = 1000   # like px, more points than this are drawn with scattergl
+
+#------------------------------------------------------------------------------#
+#     columns                                                                  #
+#------------------------------------------------------------------------------#
+def column_array(series):
+    ''' numpy array of a polars column, a view of its buffer when possible '''
+    return series.to_numpy()   # copies only with nulls, strings or many chunks
+
+def customdata_array(df, cols):
+    ''' 2d customdata, one column per name, object dtype only if mixed '''
+    return np.column_stack([column_array(df[col]) for col in cols])
+
+def trace_columns(df, customdata=None, **attr_cols):
+    ''' trace keyword arguments of columns, like x='DATE', y='SUB_PCT' '''
+    kwargs = {attr: column_array(df[col]) for attr, col in attr_cols.items()}
+    if customdata:
+        kwargs['customdata'] = customdata_array(df, customdata)
+    return kwargs
+
+#------------------------------------------------------------------------------#
+#     line charts                                                              #
+#------------------------------------------------------------------------------#
+def line_figure(df, x, y, color=None, custom_data=None, line_shape=None,
+                template=None, height=None, width=None):
+    ''' px.line of wide (list of y) or long (y and color) data, no unpivot '''
+    if isinstance(y, str):   # long data, one trace per value of color
+        groups = df.partition_by(color, maintain_order=True, as_dict=True)
+        series = [(df_group, y) for df_group in groups.values()]
+        df_sample = pl.concat([df_group.head(1) for df_group in groups.values()])
+        n_points = len(df)
+    else:                    # wide data, one trace per column of the same frame
+        series = [(df, col) for col in y]
+        df_sample = df.head(1)
+        n_points = len(df) * len(y)
+    # webgl draws no splines
+    webgl = n_points > WEBGL_POINTS and line_shape != 'spline'
+
+    # px makes the traces and layout from one row per trace, then the columns replace them
+    fig = px.line(
+        df_sample, x=x, y=y, color=color, custom_data=custom_data, line_shape=line_shape,
+        render_mode='webgl' if webgl else 'svg',
+        template=template, height=height, width=width,
+    )
+    for trace, (df_trace, y_col) in zip(fig.data, series):
+        trace.update(trace_columns(df_trace, x=x, y=y_col, customdata=custom_data))
+    return fig
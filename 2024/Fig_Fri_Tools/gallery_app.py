@@ -0,0 +1,211 @@
+'''
+Interactive gallery of the weekly figures, a Dash app on the precomputed store.
+
+Every callback is a slice of the arrays gallery_store.py saved, never a read of
+the weekly data, and goes through an lru_cache of LRU_SIZE figure dicts, so
+the same control values are answered without building the figure again:
+
+    week 40   year range and normalized heat map of votes, from the tensor
+    week 41   ridership % by year of one service, raw or rolling mean
+    week 42   length and weight of the snakes of one family
+    others    any figure of the weeks gallery_build.py saved
+
+    python gallery_store.py     # first, and after the data or scripts change
+    python gallery_app.py       # http://127.0.0.1:8050
+
+gallery_load_test.py sends callback requests of concurrent users to the app.
+'''
+import sys
+from functools import lru_cache
+
+import plotly.graph_objects as go
+from dash import Dash, MATCH, Input, Output, dcc, html
+
+from fig_json import encode_figure
+from gallery_store import VOTES_WEEK, load_store
+from week_runner import week_dir
+
+sys.path.append(str(week_dir(VOTES_WEEK)))   # heat map and tensor of week 40
+from heatmap_engine import auto_color_range, make_heatmap_fig
+from vote_tensor import year_range_matrix
+
+# constants
+LRU_SIZE = 256   # figures kept per callback
+HEATMAP_SIZE = 900
+store = load_store()
+
+#------------------------------------------------------------------------------#
+#     figures, memoized by control values                                      #
+#------------------------------------------------------------------------------#
+@lru_cache(maxsize=LRU_SIZE)
+def votes_figure(first_year, last_year, normalized):
+    ''' heat map of votes from first_year to last_year '''
+    z, x_labels, y_labels = year_range_matrix(store['votes'], first_year, last_year, normalized)
+    hover_entity = 'Normalized Votes' if normalized else 'Votes'
+    fig = make_heatmap_fig(
+        z,
+        x_labels,
+        y_labels,
+        color_range=auto_color_range(z),
+        my_title=f'{hover_entity} {first_year} to {last_year}',
+        x_title='VOTES TO COUNTRY',
+        y_title='VOTES FROM COUNTRY',
+        hover_entity=hover_entity,
+        size=HEATMAP_SIZE,
+    )
+    return encode_figure(fig)
+
+@lru_cache(maxsize=LRU_SIZE)
+def ridership_figure(service, rolling_mean):
+    ''' ridership % relative to pre-pandemic, one line per year '''
+    mta = store['mta']
+    pct = mta['pct'][int(rolling_mean), list(mta['services']).index(service)]
+    fig = go.Figure(
+        [
+            go.Scatter(x=mta['days'], y=pct[:, i], name=str(year), mode='lines')
+            for i, year in reversed(list(enumerate(mta['years'])))
+        ]
+    )
+    title = f'NYC {service} ridership, relative to pre-pandemic'.upper()
+    fig.update_layout(
+        template='simple_white',
+        title=title + (', ROLLING MEAN =7' if rolling_mean else ''),
+        xaxis_tickformat='%b',
+        xaxis_hoverformat='%b %d',
+        yaxis_tickformat='.0%',
+        yaxis_title='RIDERSHIP % RELATIVE TO PRE-PANDEMIC',
+        yaxis_range=[0, 1.5],
+        legend_title_text='YEAR',
+        hovermode='x unified',
+        height=600,
+    )
+    return encode_figure(fig)
+
+@lru_cache(maxsize=LRU_SIZE)
+def snakes_figure(family):
+    ''' weight against length of the snakes of one family '''
+    snakes = store['snakes']
+    i = list(snakes['families']).index(family)
+    rows = slice(snakes['offsets'][i], snakes['offsets'][i + 1])
+    fig = go.Figure(
+        go.Scatter(
+            x=snakes['length'][rows],
+            y=snakes['weight'][rows],
+            customdata=snakes['names'][rows],
+            mode='markers',
+            marker=dict(color='green'),
+            hovertemplate=(
+                '<b>%{customdata}</b><br>' +
+                'Length: %{x} cm<br>' +
+                'Weight: %{y:,} gr' +
+                '<extra></extra>'
+            ),
+        )
+    )
+    fig.update_layout(
+        template='simple_white',
+        title=f'<b>{family}</b>: weight vs length',
+        xaxis_title='Length (cm)',
+        yaxis_title='Weight (grams)',
+        height=600,
+    )
+    return encode_figure(fig)
+
+@lru_cache(maxsize=LRU_SIZE)
+def saved_figure(figure_key):
+    ''' saved figure of a week, key like Week_46_Wine/1 '''
+    week, number = figure_key.split('/')
+    return store['figures'][week][int(number) - 1]
+
+#------------------------------------------------------------------------------#
+#     layout                                                                   #
+#------------------------------------------------------------------------------#
+def week_label(week):
+    ''' tab label of a week folder, like Week 46 Wine '''
+    return week.replace('_', ' ')
+
+def votes_tab():
+    ''' year range slider and normalized switch of the week 40 heat map '''
+    first_year, last_year = store['votes']['first_year'], store['votes']['last_year']
+    return dcc.Tab(label=week_label(VOTES_WEEK), children=[
+        dcc.RangeSlider(
+            id='vote-years', min=first_year, max=last_year, step=1,
+            value=[first_year, last_year], allowCross=False,
+            marks={year: str(year) for year in range(first_year, last_year + 1, 10)},
+            tooltip={'placement': 'bottom'},
+        ),
+        dcc.Checklist(id='vote-normalized', options=['normalized'], value=[]),
+        dcc.Graph(id='vote-graph'),
+    ])
+
+def ridership_tab():
+    ''' service dropdown and rolling mean switch of the week 41 lines '''
+    services = list(store['mta']['services'])
+    return dcc.Tab(label=week_label('Week_41_NYC_Transit'), children=[
+        dcc.Dropdown(id='mta-service', options=services, value=services[0], clearable=False),
+        dcc.Checklist(id='mta-rolling', options=['rolling mean'], value=[]),
+        dcc.Graph(id='mta-graph'),
+    ])
+
+def snakes_tab():
+    ''' family dropdown of the week 42 scatter '''
+    families = list(store['snakes']['families'])
+    return dcc.Tab(label=week_label('Week_42_Snakes'), children=[
+        dcc.Dropdown(id='snake-family', options=families, value='Pythonidae', clearable=False),
+        dcc.Graph(id='snake-graph'),
+    ])
+
+def saved_tab(week, figures):
+    ''' figure dropdown of a week with saved figures '''
+    options = [
+        {'label': f'Figure {i + 1}', 'value': f'{week}/{i + 1}'} for i in range(len(figures))
+    ]
+    return dcc.Tab(label=week_label(week), children=[
+        dcc.Dropdown(
+            id={'type': 'saved-figure', 'week': week},
+            options=options, value=options[0]['value'], clearable=False,
+        ),
+        dcc.Graph(id={'type': 'saved-graph', 'week': week}),
+    ])
+
+app = Dash(__name__, title='Figure Friday 2024')
+app.layout = html.Div([
+    html.H2('Figure Friday 2024'),
+    dcc.Tabs(
+        children=[votes_tab(), ridership_tab(), snakes_tab()]
+            + [saved_tab(week, figures) for week, figures in store['figures'].items()],
+    ),
+])
+
+#------------------------------------------------------------------------------#
+#     callbacks, control values to the memoized figures                        #
+#------------------------------------------------------------------------------#
+@app.callback(
+    Output('vote-graph', 'figure'),
+    Input('vote-years', 'value'),
+    Input('vote-normalized', 'value'),
+)
+def update_votes(years, normalized):
+    return votes_figure(years[0], years[1], bool(normalized))
+
+@app.callback(
+    Output('mta-graph', 'figure'),
+    Input('mta-service', 'value'),
+    Input('mta-rolling', 'value'),
+)
+def update_ridership(service, rolling_mean):
+    return ridership_figure(service, bool(rolling_mean))
+
+@app.callback(Output('snake-graph', 'figure'), Input('snake-family', 'value'))
+def update_snakes(family):
+    return snakes_figure(family)
+
+@app.callback(
+    Output({'type': 'saved-graph', 'week': MATCH}, 'figure'),
+    Input({'type': 'saved-figure', 'week': MATCH}, 'value'),
+)
+def update_saved(figure_key):
+    return saved_figure(figure_key)
+
+if __name__ == '__main__':
+    app.run(debug=False)
@@ -0,0 +1,282 @@
+'''
+Incremental gallery build: rerun a week only when its inputs changed.
+
+The inputs of a week are its script, the modules it imports from the week
+folder and from folders put on sys.path (Fig_Fri_Tools, Week_46_Wine ...),
+followed through their own imports, the data files of the week folder and its
+subfolders (like data/Germany_geo.json of week 44), except the caches the
+scripts write there, and the versions of python and the plotting libraries. Their content hashes go in
+gallery_cache/manifest.json. Each week is built in 3 stages, and each stage
+only runs when what it depends on changed:
+
+    figures   run the script, save the json of every figure it shows and of
+              every figure it writes to html          <- inputs of the week
+    html      write the html files from the saved json <- saved json
+    audit     payload_audit.py of the saved json       <- saved json, budgets
+
+A changed budget file reruns only the audit, a deleted html file is written
+again from the saved json, and neither runs the script. Files are only hashed
+again when their size or modification time changed. A week that failed is run
+again on the next build, its error may have been a network failure, unless
+--skip-failed keeps it failed until its inputs change.
+
+Data read from a URL is not an input: week 44, and week 45 with
+SOURCE_LOCAL = False, download their csv files in the script, so a change of
+the online data is only picked up with --force.
+
+    python gallery_build.py                      # all weeks
+    python gallery_build.py Week_46_Wine --force # rerun the script anyway
+    python gallery_build.py --skip-failed        # offline, leave failed weeks
+
+Exit code is 1 if a week failed or a figure is over its payload budget.
+'''
+import argparse
+import ast
+import hashlib
+import json
+import platform
+import sys
+import time
+from fnmatch import fnmatch
+from importlib.metadata import version
+from pathlib import Path
+
+from week_runner import YEAR_DIR, week_dir, week_scripts
+
+# constants
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_DIR = TOOLS_DIR / 'gallery_cache'
+MANIFEST_FILE = CACHE_DIR / 'manifest.json'
+BUDGET_FILE = TOOLS_DIR / 'payload_budgets.json'
+DATA_SUFFIXES = {'.csv', '.parquet', '.xlsx', '.json', '.geojson'}
+GENERATED = [   # caches the scripts write in their week folder, not inputs
+    'vote_tensor*', 'ufo_index.npz', 'data/geo_cache/*', 'wb_store/*', 'static/*',
+]
+LIBRARIES = ['plotly', 'polars', 'numpy', 'narwhals']
+
+#------------------------------------------------------------------------------#
+#     content hashes                                                           #
+#------------------------------------------------------------------------------#
+def digest(*parts):
+    ''' sha256 hex of strings, in order '''
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode())
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+def file_hash(path, known):
+    ''' sha256 of a file, reused from known while its size and mtime match '''
+    stat = path.stat()
+    key = str(path.relative_to(YEAR_DIR))
+    size_mtime = [stat.st_size, stat.st_mtime_ns]
+    if known.get(key, [None, None])[:2] != size_mtime:
+        known[key] = size_mtime + [hashlib.sha256(path.read_bytes()).hexdigest()]
+    return known[key][2]
+
+def library_versions():
+    ''' python and plotting library versions, without importing them '''
+    return [f'python {platform.python_version()}'] + [f'{lib} {version(lib)}' for lib in LIBRARIES]
+
+#------------------------------------------------------------------------------#
+#     inputs of a week                                                         #
+#------------------------------------------------------------------------------#
+def path_folder(node, path, folder):
+    ''' folder of a sys.path argument, a constant or built from __file__ '''
+    namespace = {'__builtins__': {'str': str}, 'Path': Path, '__file__': str(path)}
+    try:
+        return (folder / eval(compile(ast.Expression(node), str(path), 'eval'), namespace)).resolve()
+    except Exception:   # built from anything else, not followed
+        return None
+
+def local_imports(path, folder):
+    ''' imported module names and sys.path folders of a python file '''
+    tree = ast.parse(path.read_text())
+    names, folders = set(), []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names |= {alias.name.split('.')[0] for alias in node.names}
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+        elif (isinstance(node, ast.Call) and ast.unparse(node.func) in
+                ('sys.path.append', 'sys.path.insert') and node.args):
+            folders.append(path_folder(node.args[-1], path, folder))
+    return names, [f for f in folders if f is not None]
+
+def code_files(week):
+    ''' the script and every local module it imports, followed recursively '''
+    folder = week_dir(week)
+    todo, found, search = [folder / week_scripts[week]], [], [folder]
+    while todo:
+        path = todo.pop()
+        if path in found:
+            continue
+        found.append(path)
+        names, folders = local_imports(path, folder)   # scripts run in the week folder
+        search += [f for f in folders if f not in search]
+        todo += [d / f'{name}.py' for name in names for d in search if (d / f'{name}.py').exists()]
+    return sorted(found)
+
+def data_files(week):
+    ''' data files of the week folder and its subfolders, without the caches '''
+    folder = week_dir(week)
+    return sorted(
+        p for p in folder.rglob('*')
+        if p.suffix in DATA_SUFFIXES and p.is_file()
+        and not any(fnmatch(p.relative_to(folder).as_posix(), g) for g in GENERATED)
+    )
+
+def inputs_digest(week, known):
+    ''' one hash of the code, data and library versions of a week '''
+    paths = code_files(week) + data_files(week)
+    return digest(
+        *library_versions(),
+        *[f'{p.relative_to(YEAR_DIR)} {file_hash(p, known)}' for p in paths],
+    )
+
+#------------------------------------------------------------------------------#
+#     stages                                                                   #
+#------------------------------------------------------------------------------#
+def save_json(fig, path):
+    ''' figure json to path, returns its hash '''
+    text = fig.to_json()
+    path.write_text(text)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def build_figures(week):
+    ''' run the week script, save json of figures shown and html written '''
+    from week_runner import collect_figures
+
+    out_dir = CACHE_DIR / week
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old in out_dir.glob('*.json'):
+        old.unlink()
+
+    html = {}
+
+    def keep_html(fig, file, *args, **kwargs):   # the html stage writes it
+        name = Path(file).name
+        html[name] = {'json': save_json(fig, out_dir / f'{name}.json'), 'written': None}
+
+    figs = collect_figures(week, write_files=True, html_writer=keep_html)
+    figures = [save_json(fig, out_dir / f'fig_{i + 1:02d}.json') for i, fig in enumerate(figs)]
+    return {'figures': figures, 'html': html}
+
+def write_html_files(week, entry):
+    ''' write the html files whose json changed, or that are missing '''
+    import plotly.io as pio
+
+    written = []
+    for name, html in entry['html'].items():
+        if html['written'] == html['json'] and (week_dir(week) / name).exists():
+            continue
+        fig_dict = json.loads((CACHE_DIR / week / f'{name}.json').read_text())
+        pio.write_html(fig_dict, week_dir(week) / name, validate=False)
+        html['written'] = html['json']
+        written.append(name)
+    return written
+
+def audit_figures(week, entry):
+    ''' payload audit of the saved figure json, list of violations '''
+    from payload_audit import audit_figure, figure_key, load_budgets
+
+    budgets = load_budgets(BUDGET_FILE)
+    violations = []
+    for i in range(len(entry['figures'])):
+        fig_dict = json.loads((CACHE_DIR / week / f'fig_{i + 1:02d}.json').read_text())
+        violations += audit_figure(fig_dict, figure_key(week, i + 1), budgets)[2]
+    return violations
+
+#------------------------------------------------------------------------------#
+#     build                                                                    #
+#------------------------------------------------------------------------------#
+def load_manifest():
+    ''' manifest of the last build, empty if none '''
+    if MANIFEST_FILE.exists():
+        return json.loads(MANIFEST_FILE.read_text())
+    return {'files': {}, 'weeks': {}}
+
+def build_week(week, manifest, force=False, audit=True, skip_failed=False):
+    ''' run the stages of a week that are out of date, returns report row '''
+    start = time.perf_counter()
+    entry = manifest['weeks'].get(week, {})
+    inputs = inputs_digest(week, manifest['files'])
+    cache_ok = all(
+        (CACHE_DIR / week / name).exists()
+        for name in [f'fig_{i + 1:02d}.json' for i in range(len(entry.get('figures', [])))]
+                    + [f'{name}.json' for name in entry.get('html', {})]
+    )
+    stages = []
+
+    retry = entry.get('status') == 'failed' and not skip_failed
+    if force or retry or entry.get('inputs') != inputs or not cache_ok:
+        stages.append('figures')
+        old_entry = entry
+        try:
+            entry = {'inputs': inputs, 'status': 'ok'} | build_figures(week)
+            # same json, the html and the audit of the old build are still good
+            for name, html in entry['html'].items():
+                if old_entry.get('html', {}).get(name, {}).get('json') == html['json']:
+                    html['written'] = old_entry['html'][name]['written']
+            if 'audit' in old_entry:
+                entry |= {key: old_entry[key] for key in ['audit', 'violations']}
+        except Exception as err:   # one broken week does not stop the gallery
+            entry = {'inputs': inputs, 'status': 'failed',
+                     'error': f'{type(err).__name__}: {str(err).splitlines()[0]}'}
+        manifest['weeks'][week] = entry
+    elif entry['status'] == 'failed':
+        stages.append('failed before, inputs unchanged, skipped')
+
+    if entry['status'] == 'ok':
+        if write_html_files(week, entry):
+            stages.append('html')
+        if audit:
+            audit_inputs = digest(*entry['figures'], file_hash(BUDGET_FILE, manifest['files']))
+            if entry.get('audit') != audit_inputs:
+                stages.append('audit')
+                entry['violations'] = audit_figures(week, entry)
+                entry['audit'] = audit_inputs
+
+    return {
+        'WEEK'       : week,
+        'STATUS'     : entry['status'],
+        'FIGURES'    : len(entry.get('figures', [])),
+        'RAN'        : ', '.join(stages) or 'nothing, up to date',
+        'SECONDS'    : round(time.perf_counter() - start, 3),
+        'ERROR'      : entry.get('error', ''),
+        'VIOLATIONS' : entry.get('violations', []) if audit else [],
+    }
+
+def build(weeks, force=False, audit=True, skip_failed=False):
+    ''' build weeks, save the manifest after each one, list of report rows '''
+    CACHE_DIR.mkdir(exist_ok=True)
+    manifest = load_manifest()
+    rows = []
+    for week in weeks:
+        rows.append(build_week(week, manifest, force, audit, skip_failed))
+        MANIFEST_FILE.write_text(json.dumps(manifest, indent=1, sort_keys=True) + '\n')
+    return rows
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='incremental gallery build')
+    parser.add_argument('weeks', nargs='*', help='week folders, default all')
+    parser.add_argument('--force', action='store_true', help='rerun every script')
+    parser.add_argument('--no-audit', action='store_true', help='skip the payload audit')
+    parser.add_argument('--skip-failed', action='store_true',
+                        help='do not rerun failed weeks with unchanged inputs')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = build(args.weeks or list(week_scripts), args.force, not args.no_audit,
+                 args.skip_failed)
+    problems = False
+    for row in rows:
+        print(f"{row['WEEK']:30} {row['STATUS']:7} {row['FIGURES']:2} figures  "
+              f"{row['SECONDS']:7.3f} s  {row['RAN']}")
+        if row['ERROR']:
+            print(f"{'':30} {row['ERROR']}")
+        for line in row['VIOLATIONS']:
+            print(f"{'':30} OVER BUDGET {line}")
+        problems |= row['STATUS'] != 'ok' or bool(row['VIOLATIONS'])
+    print(f'gallery built in {time.perf_counter() - start:.3f} s')
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,156 @@
+'''
+Load test of gallery_app.py: callback latency under concurrent simulated users.
+
+Each user is a thread with its own Flask test client of the app, and sends
+REQUESTS callback requests, the POST to /_dash-update-component the browser
+sends when a control changes, with values drawn at random: a year range and
+normalized switch, a service and rolling mean switch, a snake family, or a
+saved figure. Year ranges start and end on multiples of YEAR_STEP, the way a
+slider is mostly dragged to round years. The time of a request is from the post
+to the complete json response, in the server code of the app, without network
+or browser, like a threaded server with one process.
+
+The same requests run twice, first with empty LRU caches, then again with the
+caches the first pass filled. The report has p50, p99 and max ms and requests
+per second of each callback and pass, and the hits and misses of each cache.
+
+    python gallery_load_test.py                    # USERS users, REQUESTS each
+    python gallery_load_test.py --users 50 --requests 200
+'''
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import polars as pl
+
+import gallery_app
+from gallery_app import app, store
+
+# constants
+USERS = 20
+REQUESTS = 50   # per user
+YEAR_STEP = 5
+memoized = {   # callback: its lru_cache function in gallery_app
+    'votes'     : gallery_app.votes_figure,
+    'ridership' : gallery_app.ridership_figure,
+    'snakes'    : gallery_app.snakes_figure,
+    'saved'     : gallery_app.saved_figure,
+}
+
+#------------------------------------------------------------------------------#
+#     requests of a simulated user                                             #
+#------------------------------------------------------------------------------#
+def request_body(output, output_id, inputs):
+    ''' json body of a callback request, inputs as list of (id, value) '''
+    return {
+        'output'         : output,
+        'outputs'        : {'id': output_id, 'property': 'figure'},
+        'inputs'         : [{'id': id, 'property': 'value', 'value': v} for id, v in inputs],
+        'changedPropIds' : [],
+        'state'          : [],
+    }
+
+def random_request(rng, saved_output):
+    ''' callback name and body of one request with random control values '''
+    callback = rng.choice(list(memoized) if store['figures'] else list(memoized)[:3])
+    if callback == 'votes':
+        first_year, last_year = store['votes']['first_year'], store['votes']['last_year']
+        years = sorted(rng.sample(range(first_year, last_year + 1, YEAR_STEP), 2))
+        normalized = rng.choice([[], ['normalized']])
+        body = request_body('vote-graph.figure', 'vote-graph',
+                            [('vote-years', years), ('vote-normalized', normalized)])
+    elif callback == 'ridership':
+        service = str(rng.choice(store['mta']['services']))
+        rolling_mean = rng.choice([[], ['rolling mean']])
+        body = request_body('mta-graph.figure', 'mta-graph',
+                            [('mta-service', service), ('mta-rolling', rolling_mean)])
+    elif callback == 'snakes':
+        family = str(rng.choice(store['snakes']['families']))
+        body = request_body('snake-graph.figure', 'snake-graph', [('snake-family', family)])
+    else:
+        week = rng.choice(list(store['figures']))
+        number = rng.randint(1, len(store['figures'][week]))
+        body = request_body(saved_output, {'type': 'saved-graph', 'week': week},
+                            [({'type': 'saved-figure', 'week': week}, f'{week}/{number}')])
+    return callback, body
+
+def run_user(user, n_requests, saved_output):
+    ''' list of (callback, seconds) of one user, same requests for a seed '''
+    rng = random.Random(user)
+    client = app.server.test_client()
+    timings = []
+    for _ in range(n_requests):
+        callback, body = random_request(rng, saved_output)
+        start = time.perf_counter()
+        response = client.post('/_dash-update-component', json=body)
+        seconds = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f'{callback}: status {response.status_code}, {body["inputs"]}')
+        timings.append((callback, seconds))
+    return timings
+
+#------------------------------------------------------------------------------#
+#     load test                                                                #
+#------------------------------------------------------------------------------#
+def run_pass(users, n_requests, saved_output):
+    ''' timings of all users at once, and the wall time in seconds '''
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        results = pool.map(lambda user: run_user(user, n_requests, saved_output), range(users))
+        timings = [timing for user_timings in results for timing in user_timings]
+    return timings, time.perf_counter() - start
+
+def latency_rows(label, timings, wall_seconds):
+    ''' p50, p99 and max ms of each callback, and of all of them '''
+    rows = []
+    for callback in list(memoized) + ['all']:
+        ms = 1000 * np.array([s for c, s in timings if callback in (c, 'all')])
+        if not ms.size:
+            continue
+        rows.append(
+            {
+                'PASS'       : label,
+                'CALLBACK'   : callback,
+                'REQUESTS'   : ms.size,
+                'P50_MS'     : round(float(np.percentile(ms, 50)), 2),
+                'P99_MS'     : round(float(np.percentile(ms, 99)), 2),
+                'MAX_MS'     : round(float(ms.max()), 2),
+                'PER_SECOND' : round(ms.size / wall_seconds, 1),
+            }
+        )
+    return rows
+
+def cache_rows():
+    ''' hits, misses and size of the LRU cache of each callback '''
+    return [
+        {'CALLBACK': callback, 'HITS': info.hits, 'MISSES': info.misses,
+         'CACHED': info.currsize, 'MAX_SIZE': info.maxsize}
+        for callback, info in ((c, f.cache_info()) for c, f in memoized.items())
+    ]
+
+def load_test(users=USERS, n_requests=REQUESTS):
+    ''' latency and cache dataframes of a cold and a warm pass '''
+    client = app.server.test_client()
+    dependencies = json.loads(client.get('/_dash-dependencies').data)
+    saved_output = next(d['output'] for d in dependencies if 'saved-graph' in d['output'])
+    for figure_function in memoized.values():
+        figure_function.cache_clear()
+    rows = []
+    for label in ['cold', 'warm']:
+        rows += latency_rows(label, *run_pass(users, n_requests, saved_output))
+    return pl.DataFrame(rows), pl.DataFrame(cache_rows())
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='load test of the gallery callbacks')
+    parser.add_argument('--users', type=int, default=USERS, help='concurrent users')
+    parser.add_argument('--requests', type=int, default=REQUESTS, help='requests per user')
+    args = parser.parse_args()
+
+    df_latency, df_cache = load_test(args.users, args.requests)
+    print(f'{args.users} users, {args.requests} requests each')
+    with pl.Config(tbl_rows=-1, tbl_hide_dataframe_shape=True):
+        print(df_latency)
+        print(df_cache)
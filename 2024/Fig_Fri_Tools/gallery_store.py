@@ -0,0 +1,157 @@
+'''
+Precomputed store of the interactive gallery, gallery_app.py.
+
+build_store does all the reading, grouping and rolling of the weekly data once
+and saves the results as numpy arrays, so a callback of the app only slices
+them, it never goes back to a csv file or a dataframe:
+
+    week 40   cumulative vote tensor of vote_tensor.py, any year range is the
+              difference of two slices
+    week 41   % of pre-pandemic ridership, as (raw or rolling mean) x service
+              x day of year x year, in gallery_store/mta.npz
+    week 42   length and weight of every snake sorted by family, with the
+              offset of each family, in gallery_store/snakes.npz
+    others    the figure json saved by gallery_build.py in gallery_cache/
+
+    python gallery_store.py    # build or refresh, only changed weeks rerun
+'''
+import json
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from dataset_schemas import scan_dataset
+from gallery_build import CACHE_DIR, TOOLS_DIR, build, load_manifest
+from week_runner import week_dir, week_scripts
+
+VOTES_WEEK = 'Week_40_Eurovision'
+sys.path.append(str(week_dir(VOTES_WEEK)))   # tensor of week 40
+from vote_tensor import TENSOR_PATH, get_vote_tensor, load_vote_tensor
+
+# constants
+STORE_DIR = TOOLS_DIR / 'gallery_store'
+ROLLING_DAYS = 7   # same smoothing as the week 41 script
+LEAP_YEAR = 2020   # every month and day has a place in the day axis
+INTERACTIVE_WEEKS = [VOTES_WEEK, 'Week_41_NYC_Transit', 'Week_42_Snakes']
+services = [   # column prefix of the mta data, in dropdown order
+    'Subways', 'Buses', 'LIRR', 'Metro-North', 'Access-A-Ride',
+    'Bridges and Tunnels', 'Staten Island Railway',
+]
+
+#------------------------------------------------------------------------------#
+#     build                                                                    #
+#------------------------------------------------------------------------------#
+def build_mta():
+    ''' save ridership % by service, day of year and year, raw and rolling '''
+    df = (
+        scan_dataset('mta')
+        .select(
+            DATE=pl.col('Date').str.to_date('%m/%d/%Y'),
+            *[pl.col(f'{s}: % of Comparable Pre-Pandemic Day') / 100 for s in services],
+        )
+        .with_columns(
+            YEAR=pl.col('DATE').dt.year(),
+            DAY_INDEX=pl.date(LEAP_YEAR, pl.col('DATE').dt.month(), pl.col('DATE').dt.day())
+                .dt.ordinal_day() - 1,
+        )
+        .collect()
+    )
+    days = pl.date_range(pl.date(LEAP_YEAR, 1, 1), pl.date(LEAP_YEAR, 12, 31), eager=True)
+    years = np.sort(df['YEAR'].unique().to_numpy())
+    year_index = np.searchsorted(years, df['YEAR'].to_numpy())
+    day_index = df['DAY_INDEX'].to_numpy()
+
+    pct = np.full((2, len(services), len(days), len(years)), np.nan, dtype=np.float32)
+    for i, service in enumerate(services):
+        pct[0, i, day_index, year_index] = df[f'{service}: % of Comparable Pre-Pandemic Day']
+        # rolling mean along the days of each year, missing days break the window
+        pct[1, i] = (
+            pl.DataFrame(pct[0, i])
+            .fill_nan(None)
+            .select(pl.all().rolling_mean(window_size=ROLLING_DAYS))
+            .to_numpy()
+        )
+    np.savez(
+        STORE_DIR / 'mta.npz',
+        pct=pct,
+        days=days.to_numpy(),   # dates, typed arrays in the figure json
+        years=years,
+        services=np.array(services),
+    )
+
+def build_snakes():
+    ''' save length, weight and name of snakes, sorted by family '''
+    df = (
+        scan_dataset('snakes')
+        .select(
+            'Family',
+            pl.coalesce('Common Name', 'Binomial').str.to_titlecase().alias('NAME'),
+            'TBL cm',
+            'Weight gr',
+        )
+        .drop_nulls(['Family', 'TBL cm', 'Weight gr'])
+        .sort('Family', 'TBL cm')
+        .collect()
+    )
+    df_family = df.group_by('Family', maintain_order=True).len()
+    np.savez(
+        STORE_DIR / 'snakes.npz',
+        families=df_family['Family'].to_numpy().astype(str),
+        offsets=np.concatenate([[0], df_family['len'].cum_sum().to_numpy()]),
+        names=df['NAME'].to_numpy().astype(str),
+        length=df['TBL cm'].to_numpy(),
+        weight=df['Weight gr'].to_numpy(),
+    )
+
+def build_votes():
+    ''' vote tensor of week 40, rebuilt when older than votes.csv '''
+    folder = week_dir(VOTES_WEEK)
+    get_vote_tensor(folder / 'votes.csv', folder / 'countries.csv', folder / TENSOR_PATH)
+
+def build_store():
+    ''' build every part of the store, report rows of the saved figure weeks '''
+    STORE_DIR.mkdir(exist_ok=True)
+    for build_part in [build_votes, build_mta, build_snakes]:
+        start = time.perf_counter()
+        build_part()
+        print(f'{build_part.__name__:30} {time.perf_counter() - start:7.3f} s')
+    static_weeks = [week for week in week_scripts if week not in INTERACTIVE_WEEKS]
+    return build(static_weeks, audit=False)
+
+#------------------------------------------------------------------------------#
+#     load                                                                     #
+#------------------------------------------------------------------------------#
+def load_npz(name):
+    ''' arrays of a saved part of the store, in a dict '''
+    with np.load(STORE_DIR / f'{name}.npz') as npz:
+        return dict(npz)
+
+def load_figures():
+    ''' week: list of figure dicts, of the weeks gallery_build.py saved '''
+    figures = {}
+    for week, entry in load_manifest()['weeks'].items():
+        if week in INTERACTIVE_WEEKS or entry['status'] != 'ok' or not entry['figures']:
+            continue
+        figures[week] = [
+            json.loads((CACHE_DIR / week / f'fig_{i + 1:02d}.json').read_text())
+            for i in range(len(entry['figures']))
+        ]
+    return figures
+
+def load_store():
+    ''' every part of the store, in memory except the memory-mapped votes '''
+    return {
+        'votes'   : load_vote_tensor(week_dir(VOTES_WEEK) / TENSOR_PATH),
+        'mta'     : load_npz('mta'),
+        'snakes'  : load_npz('snakes'),
+        'figures' : load_figures(),
+    }
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    for row in build_store():
+        print(f"{row['WEEK']:30} {row['STATUS']:7} {row['FIGURES']:2} figures  "
+              f"{row['SECONDS']:7.3f} s  {row['RAN']}")
+    print(f'gallery store built in {time.perf_counter() - start:.3f} s')
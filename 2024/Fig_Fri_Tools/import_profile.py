@@ -0,0 +1,139 @@
+'''
+Import-time profile of the weekly scripts and their helper modules.
+
+For the week script and each helper module (every other .py of the week
+folder, except benchmarks) only the top level import statements are run, and
+sys.path changes they need, nothing else, with __file__ set to the file. Helper
+modules import the shared tools from the sys.path the week script sets up, so
+Fig_Fri_Tools is on PYTHONPATH of every run. This is the startup cost paid
+before the first line of real work. Each entry runs in a fresh python -X importtime,
+REPEATS times, and the fastest run is kept. Modules python imports at startup
+are left out. The table has total import ms and the 3 top level packages that
+cost the most.
+
+    python import_profile.py                # print the table
+    python import_profile.py --record       # save it as the baseline
+    python import_profile.py Week_43_Repairs
+
+The table has the change in ms against the baseline, import_profile.json.
+It is committed as the reference: a change that adds or defers imports runs
+--record again, so the new timings show in its diff for review. The timings
+are of one machine, so small changes are noise; on another machine, record
+before a change and compare after it.
+'''
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import polars as pl
+
+from week_runner import week_dir, week_scripts
+
+# constants
+REPEATS = 7
+TOP_PACKAGES = 3
+TOOLS_DIR = Path(__file__).resolve().parent
+BASELINE_FILE = TOOLS_DIR / 'import_profile.json'
+
+def top_level_imports(path):
+    ''' source of the module level imports and sys.path changes of a file '''
+    source = Path(path).read_text()
+    return '\n'.join(
+        [f'__file__ = {str(Path(path).resolve())!r}']
+        + [
+            ast.get_source_segment(source, node)
+            for node in ast.parse(source).body
+            if isinstance(node, (ast.Import, ast.ImportFrom))
+            or ast.get_source_segment(source, node).startswith('sys.path.')
+        ]
+    )
+
+def entries(week):
+    ''' (name, python code) of the script and each helper module of a week '''
+    folder = week_dir(week)
+    script = week_scripts[week]
+    yield script, top_level_imports(folder / script)
+    for path in sorted(folder.glob('*.py')):
+        if path.name != script and not path.name.startswith('benchmark'):
+            yield path.name, top_level_imports(path)
+
+def run_importtime(code, cwd):
+    ''' completed python -X importtime run of code '''
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=cwd, capture_output=True, text=True,
+        env=os.environ | {'PYTHONPATH': str(TOOLS_DIR)},
+    )
+
+def parse_importtime(stderr, skip=()):
+    ''' total ms and dict of ms per top level package from -X importtime '''
+    total_us, packages = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.strip() in skip:
+            continue
+        total_us += int(self_us)
+        if not name.startswith('  '):   # depth 1, imported by the code itself
+            packages[name.strip()] = int(cumulative_us) / 1000
+    return total_us / 1000, packages
+
+def startup_modules():
+    ''' names of the modules python imports before running any code '''
+    return {
+        line.split('|')[-1].strip()
+        for line in run_importtime('pass', '.').stderr.splitlines()
+        if line.startswith('import time:')
+    }
+
+def profile(week, code, skip=()):
+    ''' fastest of REPEATS runs of code with -X importtime in the week folder '''
+    runs = []
+    for _ in range(REPEATS):
+        result = run_importtime(code, week_dir(week))
+        if result.returncode != 0:
+            return {'ERROR': result.stderr.strip().splitlines()[-1]}
+        runs.append(parse_importtime(result.stderr, skip))
+    total_ms, packages = min(runs, key=lambda run: run[0])
+    top = sorted(packages.items(), key=lambda item: -item[1])[:TOP_PACKAGES]
+    return {
+        'TOTAL_MS' : round(total_ms, 1),
+        'TOP'      : ', '.join(f'{p} {ms:.0f}' for p, ms in top),
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='import-time profile')
+    parser.add_argument('weeks', nargs='*', help='week folders, default all')
+    parser.add_argument('--record', action='store_true', help='save as baseline')
+    args = parser.parse_args()
+
+    rows, skip = [], startup_modules()
+    for week in args.weeks or list(week_scripts):
+        for name, code in entries(week):
+            result = profile(week, code, skip)
+            rows.append({'WEEK': week, 'MODULE': name, 'TOTAL_MS': None, 'TOP': ''} | result)
+    df = pl.DataFrame(rows, infer_schema_length=None)
+
+    baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    df = df.with_columns(
+        DELTA_MS = (
+            pl.col('TOTAL_MS') -
+            pl.struct('WEEK', 'MODULE').map_elements(
+                lambda r: baseline.get(f"{r['WEEK']}/{r['MODULE']}"),
+                return_dtype=pl.Float64)
+        ).round(1)
+    )
+    with pl.Config(tbl_rows=100, fmt_str_lengths=80, tbl_width_chars=200):
+        print(df)
+
+    if args.record:
+        baseline |= {
+            f"{row['WEEK']}/{row['MODULE']}": row['TOTAL_MS']
+            for row in df.iter_rows(named=True) if row['TOTAL_MS'] is not None
+        }
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=4, sort_keys=True) + '\n')
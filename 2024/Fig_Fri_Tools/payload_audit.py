@@ -0,0 +1,146 @@
+'''
+Payload audit: json bytes of every figure by trace, attribute and layout part.
+
+audit_figure breaks the serialized figure down into one row per trace
+attribute (x, y, customdata, text, hovertemplate ...), per layout section
+(template, shapes, annotations ...) and per animation frame, and checks the
+sizes against budgets. Budgets come from payload_budgets.json, with defaults
+for any attribute and figure, and a recorded budget for each figure of each
+week, so a figure that grows past its budget fails the audit.
+
+    python payload_audit.py                       # all weeks, exit 1 over budget
+    python payload_audit.py Week_47_UFOs --top 20 # 20 biggest parts
+    python payload_audit.py --record              # budgets = current size + 10%
+    python payload_audit.py --strict              # exit 1 if a week can not run
+
+A week whose script fails, on missing data or no network, is listed apart from
+the budget violations, its figures could not be measured. It only fails the
+audit with --strict.
+'''
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import polars as pl
+from plotly.io.json import to_json_plotly
+
+from week_runner import collect_figures, week_scripts
+
+# constants
+BUDGET_FILE = Path(__file__).resolve().parent / 'payload_budgets.json'
+RECORD_MARGIN = 1.10   # --record allows 10% growth over the current size
+default_budgets = {
+    'figure'        : 2_000_000,  # bytes of the whole figure json
+    'attribute'     : 500_000,    # any one trace attribute or layout section
+    'hovertemplate' : 2_000,      # per trace, long templates repeat per point
+    'text'          : 200_000,
+    'customdata'    : 200_000,
+}
+
+def json_bytes(value):
+    ''' bytes of value as figure json '''
+    return len(to_json_plotly(value).encode())
+
+#------------------------------------------------------------------------------#
+#     size breakdown                                                           #
+#------------------------------------------------------------------------------#
+def attribute_sizes(fig):
+    ''' dataframe of PART, TRACE, TYPE, ATTRIBUTE, BYTES, biggest first '''
+    fig_dict = fig if isinstance(fig, dict) else fig.to_plotly_json()
+    rows = []
+    for i, trace in enumerate(fig_dict.get('data', [])):
+        for key, value in trace.items():
+            rows.append(('data', i, trace.get('type', ''), key, json_bytes(value)))
+    for key, value in fig_dict.get('layout', {}).items():
+        rows.append(('layout', None, '', key, json_bytes(value)))
+    for i, frame in enumerate(fig_dict.get('frames', [])):
+        rows.append(('frames', i, '', frame.get('name', ''), json_bytes(frame)))
+    return (
+        pl.DataFrame(
+            rows,
+            schema={'PART': pl.String, 'TRACE': pl.Int32, 'TYPE': pl.String,
+                    'ATTRIBUTE': pl.String, 'BYTES': pl.Int64},
+            orient='row',
+        )
+        .sort('BYTES', descending=True)
+    )
+
+#------------------------------------------------------------------------------#
+#     budgets                                                                  #
+#------------------------------------------------------------------------------#
+def load_budgets(path=BUDGET_FILE):
+    ''' dict with defaults and per-figure budgets, defaults if no file '''
+    budgets = {'defaults': dict(default_budgets), 'figures': {}}
+    if Path(path).exists():
+        saved = json.loads(Path(path).read_text())
+        budgets['defaults'] |= saved.get('defaults', {})
+        budgets['figures'] |= saved.get('figures', {})
+    return budgets
+
+def figure_key(week, fig_num):
+    ''' key of a figure in the budget file, like Week_46_Wine/1 '''
+    return f'{week}/{fig_num}'
+
+def audit_figure(fig, key, budgets):
+    ''' size breakdown, total bytes and list of budget violations, fig or dict '''
+    df_sizes = attribute_sizes(fig)
+    total = json_bytes(fig)
+    defaults = budgets['defaults']
+    violations = []
+
+    figure_budget = budgets['figures'].get(key, defaults['figure'])
+    if total > figure_budget:
+        violations.append(f'{key}: figure {total:,} bytes > budget {figure_budget:,}')
+    for row in df_sizes.iter_rows(named=True):
+        budget = defaults.get(row['ATTRIBUTE'], defaults['attribute'])
+        if row['BYTES'] > budget:
+            where = row['PART'] if row['TRACE'] is None else f"trace {row['TRACE']}"
+            violations.append(
+                f"{key}: {where} {row['ATTRIBUTE']} {row['BYTES']:,} bytes > budget {budget:,}")
+    return df_sizes, total, violations
+
+def audit_weeks(weeks, budgets, top=5):
+    ''' audit all figures of weeks, print the biggest parts, return
+        violations, totals and the weeks whose script failed '''
+    violations, totals, failed = [], {}, []
+    for week in weeks:
+        try:
+            figs = collect_figures(week)
+        except Exception as err:   # one broken week does not stop the audit
+            print(f'{week}: FAILED, {type(err).__name__}: {err}')
+            failed.append(week)
+            continue
+        for i, fig in enumerate(figs):
+            key = figure_key(week, i + 1)
+            df_sizes, totals[key], found = audit_figure(fig, key, budgets)
+            violations += found
+            print(f'{key}: {totals[key]:,} bytes')
+            print(df_sizes.head(top))
+    return violations, totals, failed
+
+def record_budgets(totals, path=BUDGET_FILE):
+    ''' save current sizes plus RECORD_MARGIN as per-figure budgets '''
+    budgets = load_budgets(path)
+    budgets['figures'] |= {key: int(total * RECORD_MARGIN) for key, total in totals.items()}
+    Path(path).write_text(json.dumps(budgets, indent=4, sort_keys=True) + '\n')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='figure payload size audit')
+    parser.add_argument('weeks', nargs='*', help='week folders, default all')
+    parser.add_argument('--top', type=int, default=5, help='biggest parts to show')
+    parser.add_argument('--budgets', default=BUDGET_FILE, help='budget json file')
+    parser.add_argument('--record', action='store_true', help='save sizes as budgets')
+    parser.add_argument('--strict', action='store_true',
+                        help='exit 1 if a week script fails as well')
+    args = parser.parse_args()
+
+    violations, totals, failed = audit_weeks(
+        args.weeks or list(week_scripts), load_budgets(args.budgets), args.top)
+    if args.record:
+        record_budgets(totals, args.budgets)
+    for line in violations:
+        print('OVER BUDGET', line)
+    if failed:
+        print(f'not audited, the script failed: {", ".join(failed)}')
+    sys.exit(1 if (violations and not args.record) or (failed and args.strict) else 0)
@@ -0,0 +1,150 @@
+'''
+Static png / svg export of every figure of a week, with a warm renderer pool.
+
+fig.write_image starts a new kaleido browser for every image when no kaleido
+server is running, which takes seconds each time. export_figures starts one
+kaleido server with POOL_SIZE browser tabs, renders all figures of the run in
+parallel through it, and keeps it running for the next week of a batch. With
+--docx the images replace the week's own screenshot document, like
+Screenshots.docx or screenshotsdocx.docx of the week folder, or make a new
+screenshots.docx in a week without one.
+
+    python static_export.py Week_46_Wine Week_49_New_England --format png svg
+    python static_export.py --all --docx
+    python static_export.py Week_46_Wine --baseline
+
+--baseline also renders every image the old way, one fig.write_image each,
+and prints the per-image latency of both. kaleido needs Chrome, install it
+once with kaleido_get_chrome. python-docx is only needed for --docx.
+test_static_export.py renders on the pool, and skips that when Chrome is missing.
+'''
+import argparse
+import time
+
+from week_runner import collect_figures, week_dir, week_scripts
+
+# constants
+POOL_SIZE = 4         # browser tabs rendering in parallel
+STATIC_DIR = 'static' # images go here, in the week folder
+IMAGE_OPTS = dict(width=1200, height=800, scale=1)
+
+_pool_running = False
+
+#------------------------------------------------------------------------------#
+#     renderer pool                                                            #
+#------------------------------------------------------------------------------#
+def start_pool(n=POOL_SIZE):
+    ''' start the kaleido server, a no-op if it is already running '''
+    import kaleido   # starts up slowly, only import it to render
+
+    global _pool_running
+    if not _pool_running:
+        kaleido.start_sync_server(n=n, silence_warnings=True)
+        _pool_running = True
+
+def stop_pool():
+    ''' stop the kaleido server, fig.write_image goes back to one-shot '''
+    global _pool_running
+    if _pool_running:
+        import kaleido
+
+        kaleido.stop_sync_server(silence_warnings=True)
+        _pool_running = False
+
+def image_paths(week, n_figs, fmt):
+    ''' static/fig_01.png, static/fig_02.png ... of the week folder '''
+    out_dir = week_dir(week) / STATIC_DIR
+    out_dir.mkdir(exist_ok=True)
+    return [out_dir / f'fig_{i + 1:02d}.{fmt}' for i in range(n_figs)]
+
+def export_figures(figs, paths, opts=IMAGE_OPTS, pool_size=POOL_SIZE):
+    ''' render figures to paths in parallel on the warm pool, seconds taken '''
+    import kaleido
+
+    start_pool(pool_size)
+    start = time.perf_counter()
+    errors = kaleido.write_fig_from_object_sync(
+        [
+            {'fig': fig, 'path': path, 'opts': opts | {'format': path.suffix[1:]}}
+            for fig, path in zip(figs, paths)
+        ]
+    )
+    if errors:
+        raise RuntimeError(f'{len(errors)} images failed, first: {errors[0]!r}')
+    return time.perf_counter() - start
+
+def export_cold(figs, paths, opts=IMAGE_OPTS):
+    ''' the old way, fig.write_image one by one, list of seconds per image '''
+    import plotly.io as pio
+
+    stop_pool()
+    seconds = []
+    for fig, path in zip(figs, paths):
+        start = time.perf_counter()
+        pio.write_image(fig, path, **opts)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+#------------------------------------------------------------------------------#
+#     screenshot document                                                      #
+#------------------------------------------------------------------------------#
+def screenshot_doc_path(week):
+    ''' the screenshot document of the week folder, a new one if it has none '''
+    docs = sorted(
+        p for p in week_dir(week).glob('*.docx') if p.name.lower().startswith('screenshot')
+    )
+    return docs[0] if docs else week_dir(week) / 'screenshots.docx'
+
+def build_screenshot_doc(week, png_paths):
+    ''' replace the week's screenshot document, title and one image per page '''
+    from docx import Document   # only needed for the screenshot document
+    from docx.shared import Inches
+
+    doc = Document()
+    doc.add_heading(week.replace('_', ' '), level=1)
+    for i, path in enumerate(png_paths):
+        if i:
+            doc.add_page_break()
+        doc.add_picture(str(path), width=Inches(6.5))
+    doc_path = screenshot_doc_path(week)
+    doc.save(doc_path)
+    return doc_path
+
+#------------------------------------------------------------------------------#
+#     batch export                                                             #
+#------------------------------------------------------------------------------#
+def export_week(week, formats=('png',), docx=False, baseline=False,
+                pool_size=POOL_SIZE):
+    ''' export all figures of a week, returns a dict of timings '''
+    figs = collect_figures(week)
+    report = {'WEEK': week, 'FIGURES': len(figs)}
+    for fmt in formats:
+        paths = image_paths(week, len(figs), fmt)
+        seconds = export_figures(figs, paths, pool_size=pool_size)
+        report[f'{fmt.upper()}_SEC_PER_IMAGE'] = round(seconds / max(len(figs), 1), 3)
+        if baseline:
+            cold = export_cold(figs, paths)
+            report[f'{fmt.upper()}_COLD_SEC_PER_IMAGE'] = round(sum(cold) / max(len(cold), 1), 3)
+    if docx:
+        pngs = image_paths(week, len(figs), 'png')
+        if 'png' not in formats:
+            export_figures(figs, pngs, pool_size=pool_size)
+        report['DOCX'] = str(build_screenshot_doc(week, pngs))
+    return report
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='static export of weekly figures')
+    parser.add_argument('weeks', nargs='*', help='week folders, like Week_46_Wine')
+    parser.add_argument('--all', action='store_true', help='every week')
+    parser.add_argument('--format', nargs='+', default=['png'], choices=['png', 'svg'])
+    parser.add_argument('--docx', action='store_true', help='replace the screenshot document')
+    parser.add_argument('--baseline', action='store_true', help='also time cold write_image')
+    parser.add_argument('--pool', type=int, default=POOL_SIZE, help='parallel renderers')
+    args = parser.parse_args()
+
+    weeks = list(week_scripts) if args.all else args.weeks
+    try:
+        for week in weeks:
+            print(export_week(week, args.format, args.docx, args.baseline, args.pool))
+    finally:
+        stop_pool()
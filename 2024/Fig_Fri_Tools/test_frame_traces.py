@@ -0,0 +1,59 @@
+'''
+Parity of line_figure with px.line: the same figure json for wide and long
+data, below and above the scattergl switch, with splines, custom data and a
+template, so a plotly release that changes px.line fails here.
+
+    python -m pytest test_frame_traces.py
+'''
+from datetime import date, timedelta
+
+import numpy as np
+import plotly.express as px
+import polars as pl
+import pytest
+
+from frame_traces import line_figure
+
+# constants
+COLS = ['A', 'B', 'C']
+ROW_COUNTS = [10, 333, 334, 2000]   # 999 and 1002 points, either side of the scattergl switch
+
+def wide_frame(n_rows):
+    ''' DATE, a label column and one float column per name of COLS '''
+    rng = np.random.default_rng(n_rows)
+    return pl.DataFrame(
+        {
+            'DATE'  : pl.date_range(date(2024, 1, 1), date(2024, 1, 1) + timedelta(n_rows - 1),
+                                    eager=True),
+            'LABEL' : [f'day {i}' for i in range(n_rows)],
+        }
+        | {col: rng.normal(size=n_rows) for col in COLS}
+    )
+
+def long_frame(n_rows):
+    ''' the columns of wide_frame stacked, with a STATE column '''
+    return wide_frame(n_rows).unpivot(
+        index=['DATE', 'LABEL'], on=COLS, variable_name='STATE', value_name='VALUE')
+
+@pytest.mark.parametrize('n_rows', ROW_COUNTS)
+@pytest.mark.parametrize('options', [
+    {},
+    {'line_shape': 'spline'},
+    {'custom_data': ['LABEL'], 'template': 'simple_white', 'height': 400, 'width': 800},
+])
+def test_wide_matches_px(n_rows, options):
+    df = wide_frame(n_rows)
+    expected = px.line(df, x='DATE', y=COLS, **options)
+    assert line_figure(df, 'DATE', COLS, **options).to_json() == expected.to_json()
+
+@pytest.mark.parametrize('n_rows', ROW_COUNTS)
+@pytest.mark.parametrize('options', [
+    {},
+    {'line_shape': 'spline'},
+    {'custom_data': ['LABEL'], 'template': 'simple_white', 'height': 400, 'width': 800},
+])
+def test_long_matches_px(n_rows, options):
+    df = long_frame(n_rows)
+    expected = px.line(df, x='DATE', y='VALUE', color='STATE', **options)
+    assert (line_figure(df, 'DATE', 'VALUE', color='STATE', **options).to_json()
+            == expected.to_json())
@@ -0,0 +1,57 @@
+'''
+Tests of gallery_build.py on a week folder of its own, in a temporary year
+folder, so the real weeks and gallery_cache/ are never touched.
+
+    python -m pytest test_gallery_build.py
+'''
+import json
+
+import pytest
+
+import gallery_build
+import week_runner
+
+# constants
+WEEK = 'Week_99_Test'
+SCRIPT = '''
+import json
+import plotly.graph_objects as go
+
+values = json.load(open('data/values.json'))
+go.Figure(go.Bar(y=values)).show()
+'''
+
+@pytest.fixture
+def year_dir(tmp_path, monkeypatch):
+    ''' year folder with one week, reading a json file from data/ '''
+    folder = tmp_path / WEEK
+    (folder / 'data' / 'geo_cache').mkdir(parents=True)
+    (folder / 'week_99.py').write_text(SCRIPT)
+    (folder / 'data' / 'values.json').write_text(json.dumps([1, 2, 3]))
+    monkeypatch.setattr(week_runner, 'YEAR_DIR', tmp_path)
+    monkeypatch.setattr(gallery_build, 'YEAR_DIR', tmp_path)
+    monkeypatch.setattr(gallery_build, 'CACHE_DIR', tmp_path / 'gallery_cache')
+    monkeypatch.setattr(gallery_build, 'MANIFEST_FILE', tmp_path / 'gallery_cache' / 'manifest.json')
+    monkeypatch.setitem(week_runner.week_scripts, WEEK, 'week_99.py')
+    return tmp_path
+
+def ran(year_dir):
+    ''' stages a build of the test week ran '''
+    return gallery_build.build([WEEK], audit=False)[0]['RAN']
+
+def saved_figures():
+    ''' hashes of the saved figure json of the test week '''
+    return gallery_build.load_manifest()['weeks'][WEEK]['figures']
+
+def test_nested_input_change_rebuilds(year_dir):
+    assert ran(year_dir) == 'figures'
+    figures = saved_figures()
+    assert ran(year_dir) == 'nothing, up to date'
+    (year_dir / WEEK / 'data' / 'values.json').write_text(json.dumps([1, 2, 3, 4]))
+    assert ran(year_dir) == 'figures'
+    assert saved_figures() != figures
+
+def test_generated_cache_is_not_an_input(year_dir):
+    assert ran(year_dir) == 'figures'
+    (year_dir / WEEK / 'data' / 'geo_cache' / 'shapes.json').write_text('{}')
+    assert ran(year_dir) == 'nothing, up to date'
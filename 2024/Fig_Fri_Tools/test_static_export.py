@@ -0,0 +1,56 @@
+'''
+Tests of static_export.py: the screenshot document of a week folder, and a
+smoke test of the warm kaleido pool, skipped where Chrome is not installed.
+
+    python -m pytest test_static_export.py
+'''
+import base64
+
+import plotly.graph_objects as go
+import pytest
+
+import static_export
+import week_runner
+
+# constants
+WEEK = 'Week_99_Test'
+PNG_1X1 = base64.b64decode(   # smallest png, a stand-in for a rendered figure
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
+)
+
+@pytest.fixture
+def week_folder(tmp_path, monkeypatch):
+    ''' empty week folder in a temporary year folder '''
+    monkeypatch.setattr(week_runner, 'YEAR_DIR', tmp_path)
+    (tmp_path / WEEK).mkdir()
+    return tmp_path / WEEK
+
+def chrome_path():
+    ''' path of the Chrome kaleido would start, None if there is none '''
+    chromium = pytest.importorskip('choreographer.browsers.chromium')
+    return chromium.Chromium.find_browser(skip_local=False)
+
+def test_doc_replaces_the_week_document(week_folder):
+    pytest.importorskip('docx')
+    (week_folder / 'Screenshots.docx').write_bytes(b'hand-made')
+    png = week_folder / 'fig_01.png'
+    png.write_bytes(PNG_1X1)
+    doc_path = static_export.build_screenshot_doc(WEEK, [png])
+    assert doc_path == week_folder / 'Screenshots.docx'
+    assert doc_path.read_bytes()[:2] == b'PK'   # a docx is a zip file
+    assert sorted(p.name for p in week_folder.glob('*.docx')) == ['Screenshots.docx']
+
+def test_doc_of_a_week_without_one(week_folder):
+    assert static_export.screenshot_doc_path(WEEK) == week_folder / 'screenshots.docx'
+
+def test_pool_renders_png_and_svg(tmp_path):
+    if chrome_path() is None:
+        pytest.skip('no Chrome for kaleido, install it with kaleido_get_chrome')
+    figs = [go.Figure(go.Bar(y=[1, 3, 2])), go.Figure(go.Scatter(y=[2, 1, 3]))]
+    try:
+        for fmt, magic in [('png', b'\x89PNG'), ('svg', b'<svg')]:
+            paths = [tmp_path / f'fig_{i + 1:02d}.{fmt}' for i in range(len(figs))]
+            static_export.export_figures(figs, paths, pool_size=2)
+            assert all(magic in path.read_bytes()[:200] for path in paths)
+    finally:
+        static_export.stop_pool()
@@ -0,0 +1,149 @@
+'''
+Precomputed violin plots, the html gets the curves and not every data point.
+
+px.violin sends every Max_yield_hl value to the browser, which then computes a
+kernel density estimate (KDE) for each violin. Here the KDE curves and box
+statistics of each (Color, COUNTRY) group are computed in python. Yields are
+first counted by value, so the KDE works on weighted distinct values, and all
+groups are evaluated in one numpy pass. Each violin is a filled scatter outline
+of KDE_POINTS points plus a box trace with precomputed quartiles, so the html
+size stays the same however many wines are in the data set.
+
+Bandwidth is Silverman's rule, the same rule plotly.js uses for violins.
+'''
+import numpy as np
+import polars as pl
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# constants
+KDE_POINTS = 100    # points along each side of a violin outline
+HALF_WIDTH = 0.4    # widest part of each violin, in category units
+
+#------------------------------------------------------------------------------#
+#     statistics                                                               #
+#------------------------------------------------------------------------------#
+def group_stats(df, x_col, facet_col, y_col):
+    ''' quartiles, fences, count and KDE bandwidth of each group '''
+    y = pl.col(y_col).cast(pl.Float64)
+    q1 = y.quantile(0.25, interpolation='linear')
+    q3 = y.quantile(0.75, interpolation='linear')
+    return (
+        df
+        .drop_nulls(y_col)
+        .group_by(facet_col, x_col, maintain_order=True)
+        .agg(
+            N = pl.len(),
+            MIN = y.min(),
+            MAX = y.max(),
+            Q1 = q1,
+            MEDIAN = y.median(),
+            Q3 = q3,
+            STD = y.std(),
+            # whiskers end at the last data point inside 1.5 IQR, like plotly
+            LOWER_FENCE = y.filter(y >= q1 - 1.5 * (q3 - q1)).min(),
+            UPPER_FENCE = y.filter(y <= q3 + 1.5 * (q3 - q1)).max(),
+        )
+        .with_columns(
+            # Silverman's rule of thumb, as in plotly.js
+            BANDWIDTH = (
+                1.059
+                * pl.min_horizontal(pl.col('STD'), (pl.col('Q3') - pl.col('Q1')) / 1.349)
+                * pl.col('N').cast(pl.Float64).pow(-0.2)
+            ),
+        )
+        .with_columns(  # one value repeated gives 0, use 1% of the value
+            BANDWIDTH = pl.when(pl.col('BANDWIDTH') > 0)
+                .then('BANDWIDTH')
+                .otherwise(pl.max_horizontal(pl.col('MAX').abs() / 100, 1e-3))
+        )
+        .with_row_index('GROUP')
+    )
+
+def kde_curves(df, df_stats, x_col, facet_col, y_col, n_points=KDE_POINTS):
+    ''' y grid and density of every group, arrays of shape (groups, n_points) '''
+    # weighted distinct values, size does not grow with the number of rows
+    df_weights = (
+        df
+        .drop_nulls(y_col)
+        .group_by(facet_col, x_col, y_col)
+        .agg(WEIGHT = pl.len())
+        .join(df_stats.select(facet_col, x_col, 'GROUP'), on=[facet_col, x_col])
+    )
+    group = df_weights['GROUP'].to_numpy()
+    values = df_weights[y_col].to_numpy().astype(np.float64)
+    weights = df_weights['WEIGHT'].to_numpy().astype(np.float64)
+
+    bw = df_stats['BANDWIDTH'].to_numpy()
+    # grid from min - 2 bandwidths to max + 2 bandwidths, plotly 'soft' span
+    lo = df_stats['MIN'].to_numpy() - 2 * bw
+    hi = df_stats['MAX'].to_numpy() + 2 * bw
+    t = np.linspace(0.0, 1.0, n_points)
+    grid = lo[:, None] + (hi - lo)[:, None] * t[None, :]
+
+    # gaussian kernel of every distinct value on the grid of its own group
+    z = (grid[group] - values[:, None]) / bw[group][:, None]
+    contrib = weights[:, None] * np.exp(-0.5 * z * z)
+    density = np.zeros_like(grid)
+    np.add.at(density, group, contrib)
+    density /= (df_stats['N'].to_numpy() * bw * np.sqrt(2 * np.pi))[:, None]
+    return grid, density
+
+#------------------------------------------------------------------------------#
+#     figure                                                                   #
+#------------------------------------------------------------------------------#
+def make_violin_fig(df, x, y, facet_col, color_discrete_map, title='', template=None):
+    ''' faceted violins like px.violin, from precomputed curves and stats '''
+    df_stats = group_stats(df, x, facet_col, y)
+    grid, density = kde_curves(df, df_stats, x, facet_col, y)
+    # all violins same maximum width, like plotly scalemode 'width'
+    half_width = HALF_WIDTH * density / density.max(axis=1, keepdims=True)
+
+    facets = df_stats[facet_col].unique(maintain_order=True).to_list()
+    categories = df[x].unique(maintain_order=True).to_list()
+    fig = make_subplots(
+        rows=1, cols=len(facets), shared_yaxes=True,
+        subplot_titles=facets, horizontal_spacing=0.03,
+    )
+    for row in df_stats.iter_rows(named=True):
+        g = row['GROUP']
+        col = facets.index(row[facet_col]) + 1
+        pos = categories.index(row[x])
+        color = color_discrete_map.get(row[x])
+        fig.add_trace(
+            go.Scatter(   # outline, right side up then left side down
+                # float32 is plenty for an outline, half the html size
+                x=np.r_[pos + half_width[g], (pos - half_width[g])[::-1]].astype(np.float32),
+                y=np.r_[grid[g], grid[g][::-1]].astype(np.float32),
+                fill='toself',
+                fillcolor=color,
+                opacity=0.6,
+                line=dict(color=color, width=1),
+                mode='lines',
+                hoverinfo='skip',
+                name=row[x],
+            ),
+            row=1, col=col
+        )
+        fig.add_trace(
+            go.Box(
+                x=[pos],
+                q1=[row['Q1']],
+                median=[row['MEDIAN']],
+                q3=[row['Q3']],
+                lowerfence=[row['LOWER_FENCE']],
+                upperfence=[row['UPPER_FENCE']],
+                width=0.08,
+                fillcolor='black',
+                line=dict(color=color),
+                name=row[x],
+            ),
+            row=1, col=col
+        )
+    fig.update_xaxes(
+        tickmode='array',
+        tickvals=list(range(len(categories))),
+        ticktext=categories,
+    )
+    fig.update_layout(title=title, template=template)
+    return fig
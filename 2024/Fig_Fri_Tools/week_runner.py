@@ -0,0 +1,70 @@
+'''
+Run the weekly scripts and collect the figures they show, for batch tools.
+
+Each script runs in its own week folder, like it does by hand, with fig.show
+replaced by a function that keeps the figure. With write_files=False the
+fig.write_html calls of the scripts are skipped as well, nothing is written.
+html_writer, like fig_json.write_html_fast, replaces fig.write_html and keeps
+the file names the scripts use. on_show is called with each figure when the
+script shows it, for tools that measure the work done per figure.
+'''
+import os
+import runpy
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+# constants
+YEAR_DIR = Path(__file__).resolve().parent.parent
+week_scripts = {   # week folder: script that makes the figures of the week
+    'Week_40_Eurovision'           : 'Plotly_Fig_Fri_40_Eurovision.py',
+    'Week_41_NYC_Transit'          : 'Plotly_Fig_Fri_2024_Week_41_NYC_Subway.py',
+    'Week_42_Snakes'               : 'Plotly_Fig_Fri_42_Snakes.py',
+    'Week_43_Repairs'              : 'Plotly_Fig_Fri_43_Repairs.py',
+    'Week_44_German_Elections'     : 'Plotly_Fig_Fri_44_German_Elections.py',
+    'Week_45_Gantt'                : 'Plotly_Fig_Fri_45_Gantt.py',
+    'Week_46_Wine'                 : 'Plotly_Fig_Fri_46_Wine.py',
+    'Week_47_UFOs'                 : 'Plotly_Fig_Fri_47_UFOs.py',
+    'Week_48_Internet_Usage_Rates' : 'Lumars_Week_48.py',
+    'Week_49_New_England'          : 'Plotly_Fig_Fri_49_New_England.py',
+}
+
+def week_dir(week):
+    ''' path of a week folder, from its name like Week_46_Wine '''
+    return YEAR_DIR / week
+
+@contextmanager
+def in_week_folder(week):
+    ''' cwd and import path of the week folder, restored when done '''
+    old_cwd, old_path = os.getcwd(), list(sys.path)
+    os.chdir(week_dir(week))
+    sys.path.insert(0, str(week_dir(week)))
+    try:
+        yield week_dir(week)
+    finally:
+        os.chdir(old_cwd)
+        sys.path[:] = old_path
+
+def collect_figures(week, write_files=False, html_writer=None, on_show=None):
+    ''' list of figures the week script shows, in the order shown '''
+    import plotly.basedatatypes as bdt   # tools that only need the folders skip it
+
+    figs = []
+
+    def keep_figure(fig, *args, **kwargs):
+        figs.append(fig)
+        if on_show is not None:
+            on_show(fig)
+
+    old_show, old_write_html = bdt.BaseFigure.show, bdt.BaseFigure.write_html
+    bdt.BaseFigure.show = keep_figure
+    if not write_files:
+        bdt.BaseFigure.write_html = lambda fig, *args, **kwargs: None
+    elif html_writer is not None:
+        bdt.BaseFigure.write_html = html_writer
+    try:
+        with in_week_folder(week) as folder:
+            runpy.run_path(str(folder / week_scripts[week]), run_name='__main__')
+    finally:
+        bdt.BaseFigure.show, bdt.BaseFigure.write_html = old_show, old_write_html
+    return figs
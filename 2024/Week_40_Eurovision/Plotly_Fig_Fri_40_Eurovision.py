@@ -1,6 +1,19 @@
+import sys
+from pathlib import Path
+
 import polars as pl
 import plotly.express as px
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from frame_shrink import shrink
+from heatmap_engine import heatmap_matrix, make_heatmap_fig, auto_color_range
+from vote_tensor import get_vote_tensor, year_range_df, make_year_range_animation
+
+# constants
+SHOW_HISTOGRAMS = False  # if True, show histogram of data before each heatmap
+YEAR_RANGE = (2013, 2022)  # year range heatmap, 2013 split jury & televotes
+
 def make_histogram(df, my_title='No Title Provided'):
     ''' quick histogram for debug'''
     fig = px.histogram(
@@ -18,45 +31,46 @@ def make_histogram(df, my_title='No Title Provided'):
 
 def make_heatmap(
         df, 
-        my_max=10000, 
+        my_max=None, 
         my_title='No Title Provided', 
         x_title = 'No X title provided',
         y_title = 'No Y title provided',
-        hover_entity='No Hover Entity Provided'
+        hover_entity='No Hover Entity Provided',
+        show_histogram=SHOW_HISTOGRAMS,
         ):
     '''  make the heat map, various data'''
-    Y = list(df['from_country'])
-    X = list(df.columns)
-    fig = px.imshow(
-        df,
-        x=X,
-        y=Y,
-        text_auto=True, 
-        height=1200, 
-        width=1200,
-        range_color=(0,my_max),
-        labels=dict(x='To ', y='From', color=hover_entity),
+    # dense typed matrix straight to go.Heatmap, no python lists of labels
+    z, X, Y = heatmap_matrix(df, index_col='from_country')
+
+    # color range from quartiles of the data unless my_max is given
+    if my_max is None:
+        color_range = auto_color_range(z)
+    else:
+        color_range = (0, my_max)
+    if show_histogram:
+        make_histogram(df, my_title=f'{my_title}, color range {color_range}')
+
+    fig = make_heatmap_fig(
+        z,
+        X,
+        Y,
+        color_range=color_range,
+        my_title=my_title,
+        x_title=x_title,
+        y_title=y_title,
+        hover_entity=hover_entity,
     )
-    fig.update_layout(
-        template='plotly_white',
-        title=my_title.upper(), 
-        title_font = {"size": 28},
-    )
-
-    fig.update_xaxes(title_text = x_title, title_font = {"size": 20})
-    fig.update_yaxes(title_text = y_title, title_font = {"size": 20})
-    fig.update_xaxes(showgrid=False)
-    fig.update_yaxes(showgrid=False)
     fig.show()
-    return
+    return fig
 
 #------------------------------------------------------------------------------#
 #     Load data, each as a Lazy Frame and Data Frame                           #
 #------------------------------------------------------------------------------#
 df_countries_lazy = pl.scan_csv('./countries.csv')
 df_countries = df_countries_lazy.collect()
-df_votes_lazy = pl.scan_csv('./votes.csv')
-df_votes = df_votes_lazy.collect()
+df_votes_lazy = scan_dataset('votes', './votes.csv')
+df_votes = shrink(   # from_country is joined with the country names
+    df_votes_lazy.collect(), 'votes', exclude=['from_country'])
 
 #------------------------------------------------------------------------------#
 #     make dataframe for heat maps, without data normalizaitons                #
@@ -105,15 +119,11 @@ df_heat_map = (
 )
 
 #------------------------------------------------------------------------------#
-#     Make a histogram of raw data to guide color_range selection              #
+#     Heatmap of raw data, color range upper limit of Q3 + 3*IQR comes to 300, #
+#     the value picked by hand from the histogram of raw data                  #
 #------------------------------------------------------------------------------#
-
-# From this histogram, 300 is a reasonable value for filtering outliers
-make_histogram(df_heat_map, my_title='Raw Data')
-
 make_heatmap(
     df_heat_map, 
-    my_max=300, 
     my_title=('Eurovision Votes since 1956'.upper()),  
     x_title = 'VOTES TO COUNTRY',
     y_title = 'VOTES FROM COUNTRY',
@@ -193,15 +203,36 @@ for country in data_cols:
 df_normalized_heat_map = df_normalized_heat_map.drop('COUNTRY_YEAR_COUNT')
 
 #------------------------------------------------------------------------------#
-#     Make a histogram of normalized data to guide color_range selection       #
+#     Heatmap of normalized data, automatic color range upper limit is 1020    #
 #------------------------------------------------------------------------------#
-make_histogram(df_normalized_heat_map, my_title='Normalized Data')
-
 make_heatmap(
     df_normalized_heat_map, 
-    my_max=1000, 
     my_title=('Normalized Eurovision Votes since 1956'.upper()),  
     x_title = 'VOTES TO COUNTRY',
     y_title = 'VOTES FROM COUNTRY',
     hover_entity='Normalized Votes'
 )
+
+#------------------------------------------------------------------------------#
+#     Year range heatmaps from the cumulative vote tensor. votes.csv is read   #
+#     only when the tensor file is missing or older than votes.csv             #
+#------------------------------------------------------------------------------#
+vote_tensor = get_vote_tensor('./votes.csv', './countries.csv')
+
+first_year, last_year = YEAR_RANGE
+make_heatmap(
+    year_range_df(vote_tensor, first_year, last_year, normalized=True), 
+    my_title=f'Normalized Eurovision Votes {first_year} to {last_year}',  
+    x_title = 'VOTES TO COUNTRY',
+    y_title = 'VOTES FROM COUNTRY',
+    hover_entity='Normalized Votes'
+)
+
+fig = make_year_range_animation(
+    vote_tensor,
+    window=10,
+    normalized=True,
+    my_title='Normalized Eurovision Votes by Decade',
+    hover_entity='Normalized Votes'
+)
+fig.show()
@@ -0,0 +1,71 @@
+'''
+Benchmark html size and build time of the heat map, px.imshow with text_auto
+(the original make_heatmap) versus heatmap_engine. Random vote matrices of
+50, 200 and 1000 countries stand in for the real data, so the benchmark also
+covers matrix sizes that Eurovision does not have (yet).
+'''
+import time
+
+import numpy as np
+import polars as pl
+import plotly.express as px
+
+from heatmap_engine import heatmap_matrix, make_heatmap_fig
+
+# constants
+COUNTRY_COUNTS = [50, 200, 1000]
+rng = np.random.default_rng(1956)
+
+def random_vote_df(n):
+    ''' pivoted dataframe like df_heat_map, n countries, random points '''
+    names = [f'Country {i:04d}' for i in range(n)]
+    z = rng.integers(0, 400, size=(n, n), dtype=np.int64)
+    return (
+        pl.DataFrame(z, schema=names)
+        .with_columns(from_country=pl.Series(names))
+        .select(['from_country'] + names)
+    )
+
+def build_imshow(df):
+    ''' original make_heatmap path, python lists and text_auto '''
+    Y = list(df['from_country'])
+    X = list(df.columns)
+    return px.imshow(
+        df.drop('from_country'),
+        x=X[1:],
+        y=Y,
+        text_auto=True,
+        height=1200,
+        width=1200,
+        range_color=(0, 300),
+    )
+
+def build_engine(df):
+    ''' heatmap_engine path, typed matrix and texttemplate '''
+    z, X, Y = heatmap_matrix(df, index_col='from_country')
+    return make_heatmap_fig(z, X, Y, color_range=(0, 300))
+
+def measure(build, df):
+    ''' return build + serialize seconds, and html size in bytes '''
+    start = time.perf_counter()
+    html = build(df).to_html(include_plotlyjs=False, full_html=False)
+    return time.perf_counter() - start, len(html.encode())
+
+#------------------------------------------------------------------------------#
+#     run the benchmark, print a table                                         #
+#------------------------------------------------------------------------------#
+rows = []
+for n in COUNTRY_COUNTS:
+    df = random_vote_df(n)
+    for name, build in [('px.imshow text_auto', build_imshow),
+                        ('heatmap_engine', build_engine)]:
+        seconds, html_bytes = measure(build, df)
+        rows.append(
+            {
+                'COUNTRIES'  : n,
+                'PATH'       : name,
+                'SECONDS'    : round(seconds, 3),
+                'HTML_KB'    : round(html_bytes / 1024, 1),
+            }
+        )
+print(pl.DataFrame(rows))
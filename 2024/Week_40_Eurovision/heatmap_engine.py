@@ -0,0 +1,143 @@
+'''
+Heat map engine for square country-by-country matrices, like the Eurovision
+votes from each country (rows) to each country (columns).
+
+The matrix goes to go.Heatmap as one dense, typed numpy array. Plotly encodes
+typed arrays as binary, and cell labels come from texttemplate, so the html
+does not carry a pre-rendered string for every cell. Above TILE_THRESHOLD the
+matrix is averaged into tiles before plotting, and above TEXT_THRESHOLD the
+cell labels are turned off, as they are unreadable at that size anyway.
+Without a given color range, auto_color_range picks one from the quartiles.
+'''
+import numpy as np
+import plotly.graph_objects as go
+
+# constants
+TEXT_THRESHOLD = 100    # no cell labels if rows or columns exceed this value
+TILE_THRESHOLD = 250    # average cells into tiles if rows or columns exceed this
+MAX_TILES = 250         # max number of tiles per axis after tile aggregation
+IQR_FACTOR = 3.0        # color range ends at Q3 + IQR_FACTOR * IQR (far outliers)
+
+#------------------------------------------------------------------------------#
+#     matrix preparation                                                       #
+#------------------------------------------------------------------------------#
+def heatmap_matrix(df, index_col='from_country', dtype=None):
+    ''' return z matrix, x labels and y labels from a pivoted dataframe '''
+    y_labels = df[index_col].to_numpy()
+    df_data = df.drop(index_col)
+    x_labels = np.array(df_data.columns)
+    z = df_data.to_numpy()
+    if dtype is None:
+        # integers without nulls keep narrowest integer type, others are float32
+        if np.issubdtype(z.dtype, np.integer) and z.size:
+            dtype = np.promote_types(
+                np.min_scalar_type(z.min()),
+                np.min_scalar_type(z.max())
+            )
+        else:
+            dtype = np.float32
+    return z.astype(dtype, copy=False), x_labels, y_labels
+
+def auto_color_range(z, iqr_factor=IQR_FACTOR):
+    ''' color range from quartiles, clips outliers that would wash out colors '''
+    # min, Q1, Q3 and max in one pass, nan cells (no votes) are ignored
+    z_min, q1, q3, z_max = np.nanquantile(
+        z.astype(np.float64, copy=False), [0.0, 0.25, 0.75, 1.0])
+    iqr = q3 - q1
+    low = max(z_min, q1 - iqr_factor * iqr)
+    high = min(z_max, q3 + iqr_factor * iqr)
+    if high <= low:   # flat data, fall back to the full range
+        low, high = z_min, z_max
+    return float(low), float(high)
+
+def tile_matrix(z, x_labels, y_labels, max_tiles=MAX_TILES):
+    ''' average z into blocks so that neither axis exceeds max_tiles '''
+    rows, cols = z.shape
+    row_step = int(np.ceil(rows / max_tiles))
+    col_step = int(np.ceil(cols / max_tiles))
+    if row_step == 1 and col_step == 1:
+        return z, x_labels, y_labels
+
+    # pad with nan to a multiple of the tile size, nanmean ignores the padding
+    pad_rows = (-rows) % row_step
+    pad_cols = (-cols) % col_step
+    z_padded = np.pad(
+        z.astype(np.float32, copy=False),
+        ((0, pad_rows), (0, pad_cols)),
+        constant_values=np.nan
+    )
+    z_tiles = np.nanmean(
+        z_padded.reshape(
+            z_padded.shape[0] // row_step, row_step,
+            z_padded.shape[1] // col_step, col_step,
+        ),
+        axis=(1, 3)
+    ).astype(np.float32)
+
+    # tile label is first and last label of the tile, like 'Albania - Cyprus'
+    def tile_labels(labels, step):
+        first = labels[::step]
+        last = labels[np.minimum(np.arange(step - 1, len(labels) + step - 1, step),
+                                 len(labels) - 1)]
+        return np.array([f'{a} - {b}' if a != b else str(a)
+                         for a, b in zip(first, last)])
+
+    return z_tiles, tile_labels(x_labels, col_step), tile_labels(y_labels, row_step)
+
+#------------------------------------------------------------------------------#
+#     figure                                                                   #
+#------------------------------------------------------------------------------#
+def make_heatmap_fig(
+        z,
+        x_labels,
+        y_labels,
+        color_range=None,
+        my_title='No Title Provided',
+        x_title='No X title provided',
+        y_title='No Y title provided',
+        hover_entity='No Hover Entity Provided',
+        size=1200,
+        text_threshold=TEXT_THRESHOLD,
+        tile_threshold=TILE_THRESHOLD,
+        ):
+    ''' make go.Heatmap figure from a dense matrix, tiled if very large '''
+    if color_range is None:
+        color_range = auto_color_range(z)
+    if max(z.shape) > tile_threshold:
+        z, x_labels, y_labels = tile_matrix(z, x_labels, y_labels)
+        hover_entity = f'Mean {hover_entity}'
+    show_text = max(z.shape) <= text_threshold
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=z,
+            x=x_labels,
+            y=y_labels,
+            zmin=color_range[0],
+            zmax=color_range[1],
+            colorscale='Plasma',
+            texttemplate='%{z:.0f}' if show_text else None,
+            colorbar=dict(title=dict(text=hover_entity)),
+            hovertemplate=(
+                'From: %{y}<br>' +
+                'To: %{x}<br>' +
+                f'{hover_entity}: ' + '%{z:.0f}' +
+                '<extra></extra>'
+            ),
+        )
+    )
+    fig.update_layout(
+        template='plotly_white',
+        title=my_title.upper(),
+        title_font={"size": 28},
+        height=size,
+        width=size,
+    )
+    # same orientation as px.imshow, first row at the top, square cells
+    fig.update_yaxes(autorange='reversed', scaleanchor='x', constrain='domain')
+    fig.update_xaxes(constrain='domain')
+    fig.update_xaxes(title_text=x_title, title_font={"size": 20})
+    fig.update_yaxes(title_text=y_title, title_font={"size": 20})
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=False)
+    return fig
@@ -0,0 +1,232 @@
+'''
+Cumulative vote tensor for Eurovision heat maps over any range of years.
+
+build_vote_tensor reads votes.csv once and saves a (year x from x to) tensor of
+running point totals, with a leading row of zeros, as a memory-mapped .npy
+file. Points of any year range are the difference of two slices:
+
+    points[first:last] = cum_points[last + 1] - cum_points[first]
+
+Years of participation per country are kept the same way, for the normalized
+heat map, and the number of vote rows per country pair, so pairs that never
+voted in the range are empty cells, not 0. Changing the year range, or making frames for an animation, never
+goes back to votes.csv.
+'''
+import json
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from dataset_schemas import scan_dataset   # Fig_Fri_Tools, on sys.path of the caller
+
+# constants
+TENSOR_PATH = 'vote_tensor.npy'
+SHORT_NAMES = {   # shorten full names of these countries, to uncrowd the axis labels
+    'Serbia and Montenegro'  : 'Serb & Mont',
+    'Bosnia & Herzegovina'   : 'Bos & Herz',
+    'North Macedonia'        : 'N. Maced',
+    'United Kingdom'         : 'U.K.',
+}
+
+#------------------------------------------------------------------------------#
+#     build and load                                                           #
+#------------------------------------------------------------------------------#
+def build_vote_tensor(
+        votes_csv='votes.csv',
+        countries_csv='countries.csv',
+        tensor_path=TENSOR_PATH,
+        points_col='total_points',
+        ):
+    ''' save cumulative points and participation tensors, return loaded copy '''
+    df_names = (
+        pl.read_csv(countries_csv)
+        .with_columns(pl.col('country_name').replace(SHORT_NAMES))
+    )
+    code_to_name = dict(zip(df_names['country'], df_names['country_name']))
+
+    df_votes = (
+        scan_dataset('votes', votes_csv)
+        .select(
+            pl.col('year'),
+            pl.col('from_country').replace_strict(code_to_name),
+            pl.col('to_country').replace_strict(code_to_name),
+            pl.col(points_col).fill_null(0),
+        )
+        .collect()
+    )
+    names = sorted(set(df_votes['from_country']) | set(df_votes['to_country']))
+    first_year = int(df_votes['year'].min())
+    years = np.arange(first_year, int(df_votes['year'].max()) + 1)
+
+    # integer positions for every vote, in one pass over the columns
+    name_idx = {name: i for i, name in enumerate(names)}
+    y = df_votes['year'].to_numpy() - first_year
+    f = df_votes['from_country'].replace_strict(name_idx).to_numpy()
+    t = df_votes['to_country'].replace_strict(name_idx).to_numpy()
+    points = df_votes[points_col].to_numpy()
+
+    n, n_years = len(names), len(years)
+    year_points = np.zeros((n_years, n, n), dtype=np.int32)
+    np.add.at(year_points, (y, f, t), points)
+    year_counts = np.zeros((n_years, n, n), dtype=np.int32)
+    np.add.at(year_counts, (y, f, t), 1)
+
+    # participation: gave votes (from) or received votes (to) in that year
+    from_years = np.zeros((n_years, n), dtype=np.int32)
+    from_years[y, f] = 1
+    to_years = np.zeros((n_years, n), dtype=np.int32)
+    to_years[y, t] = 1
+
+    # leading row of zeros so that range sums never need a special case
+    cum_points = np.lib.format.open_memmap(
+        tensor_path, mode='w+', dtype=np.int32, shape=(n_years + 1, n, n))
+    cum_points[0] = 0
+    np.cumsum(year_points, axis=0, out=cum_points[1:])
+    cum_points.flush()
+    del cum_points
+
+    stem = Path(tensor_path).with_suffix('')
+    np.save(f'{stem}_counts.npy', np.vstack(
+        [np.zeros((1, n, n), dtype=np.int32), year_counts.cumsum(axis=0)]))
+    np.save(f'{stem}_from_years.npy', np.vstack(
+        [np.zeros((1, n), dtype=np.int32), from_years.cumsum(axis=0)]))
+    np.save(f'{stem}_to_years.npy', np.vstack(
+        [np.zeros((1, n), dtype=np.int32), to_years.cumsum(axis=0)]))
+    with open(f'{stem}.json', 'w', encoding='utf-8') as f_meta:
+        json.dump(
+            {
+                'countries': names,
+                'first_year': first_year,
+                'points_col': points_col,
+            },
+            f_meta
+        )
+    return load_vote_tensor(tensor_path)
+
+def load_vote_tensor(tensor_path=TENSOR_PATH):
+    ''' memory-map the saved tensors, return them in a dict '''
+    stem = Path(tensor_path).with_suffix('')
+    with open(f'{stem}.json', encoding='utf-8') as f_meta:
+        tensor = json.load(f_meta)
+    tensor['cum_points'] = np.load(tensor_path, mmap_mode='r')
+    tensor['cum_counts'] = np.load(f'{stem}_counts.npy', mmap_mode='r')
+    tensor['cum_from_years'] = np.load(f'{stem}_from_years.npy')
+    tensor['cum_to_years'] = np.load(f'{stem}_to_years.npy')
+    tensor['last_year'] = tensor['first_year'] + len(tensor['cum_from_years']) - 2
+    return tensor
+
+def get_vote_tensor(
+        votes_csv='votes.csv',
+        countries_csv='countries.csv',
+        tensor_path=TENSOR_PATH,
+        ):
+    ''' load the tensor, rebuild it when a file is missing or older than the csv files '''
+    stem = Path(tensor_path).with_suffix('')
+    tensor_files = [Path(tensor_path)] + [
+        Path(f'{stem}{suffix}')
+        for suffix in ['.json', '_counts.npy', '_from_years.npy', '_to_years.npy']
+    ]
+    csv_mtime = max(Path(csv).stat().st_mtime for csv in [votes_csv, countries_csv])
+    if (
+        not all(path.exists() for path in tensor_files)
+        or
+        min(path.stat().st_mtime for path in tensor_files) < csv_mtime
+    ):
+        return build_vote_tensor(votes_csv, countries_csv, tensor_path)
+    return load_vote_tensor(tensor_path)
+
+#------------------------------------------------------------------------------#
+#     year range queries                                                       #
+#------------------------------------------------------------------------------#
+def year_range_matrix(tensor, first_year, last_year, normalized=False):
+    ''' z matrix and country labels for votes from first_year to last_year '''
+    a = max(first_year, tensor['first_year']) - tensor['first_year']
+    b = min(last_year, tensor['last_year']) - tensor['first_year'] + 1
+    z = (tensor['cum_points'][b] - tensor['cum_points'][a]).astype(np.float32)
+    from_years = tensor['cum_from_years'][b] - tensor['cum_from_years'][a]
+    to_years = tensor['cum_to_years'][b] - tensor['cum_to_years'][a]
+
+    if normalized:  # same as script, 100 * points / years the voter took part
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.floor(100 * z / from_years[:, None])
+
+    # empty cells where the pair has no vote rows in this year range, like
+    # the missing cells of the pivot in the script, the diagonal included
+    z[tensor['cum_counts'][b] - tensor['cum_counts'][a] == 0] = np.nan
+    active = (from_years > 0) | (to_years > 0)
+    labels = np.array(tensor['countries'])[active]
+    return z[np.ix_(active, active)], labels, labels
+
+def year_range_df(tensor, first_year, last_year, normalized=False):
+    ''' year range as dataframe shaped like df_heat_map, for make_heatmap '''
+    z, x_labels, y_labels = year_range_matrix(
+        tensor, first_year, last_year, normalized)
+    return (
+        pl.DataFrame(z, schema=list(x_labels))
+        .fill_nan(None)
+        .with_columns(from_country=pl.Series(y_labels))
+        .select(['from_country'] + list(x_labels))
+    )
+
+#------------------------------------------------------------------------------#
+#     animation, one frame per year range                                      #
+#------------------------------------------------------------------------------#
+def make_year_range_animation(
+        tensor,
+        window=10,
+        normalized=False,
+        my_title='No Title Provided',
+        hover_entity='Votes',
+        ):
+    ''' heatmap with a slider, each frame sums votes over window years '''
+    import plotly.graph_objects as go   # plotting only, building the tensor
+    from heatmap_engine import make_heatmap_fig, auto_color_range   # needs neither
+
+    starts = range(tensor['first_year'], tensor['last_year'] + 1, window)
+    ranges = [(s, min(s + window - 1, tensor['last_year'])) for s in starts]
+
+    # frames need the same countries on each axis, so keep all countries
+    all_names = np.array(tensor['countries'])
+    frame_z = []
+    for first_year, last_year in ranges:
+        z, x_labels, _ = year_range_matrix(tensor, first_year, last_year, normalized)
+        z_full = np.full((len(all_names), len(all_names)), np.nan, dtype=np.float32)
+        idx = np.searchsorted(all_names, x_labels)
+        z_full[np.ix_(idx, idx)] = z
+        frame_z.append(z_full)
+
+    color_range = auto_color_range(np.stack(frame_z))
+    fig = make_heatmap_fig(
+        frame_z[0],
+        all_names,
+        all_names,
+        color_range=color_range,
+        my_title=my_title,
+        x_title='VOTES TO COUNTRY',
+        y_title='VOTES FROM COUNTRY',
+        hover_entity=hover_entity,
+    )
+    frame_names = [f'{a}-{b}' for a, b in ranges]
+    fig.frames = [
+        go.Frame(data=[go.Heatmap(z=z)], name=name)
+        for z, name in zip(frame_z, frame_names)
+    ]
+    fig.update_layout(
+        sliders=[
+            dict(
+                active=0,
+                currentvalue=dict(prefix='Years: '),
+                steps=[
+                    dict(
+                        label=name,
+                        method='animate',
+                        args=[[name], dict(mode='immediate',
+                                           frame=dict(duration=0, redraw=True))],
+                    )
+                    for name in frame_names
+                ],
+            )
+        ]
+    )
+    return fig
@@ -1,7 +1,15 @@
+import sys
+from pathlib import Path
+
 import polars as pl
 import plotly.express as px
 import polars.selectors as cs
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from frame_shrink import shrink
+from frame_traces import line_figure
+
 def plot_by_year(
         df, 
         rolling_mean=0, 
@@ -10,7 +18,7 @@ def plot_by_year(
         annotate_x=0,
         annotate_y=0,
         ):
-    ''' Function to make px.line by year with custom annotation'''
+    ''' Function to make line chart by year with custom annotation'''
     if rolling_mean:
         df = (
             df
@@ -23,13 +31,8 @@ def plot_by_year(
             )
         )
 
-    fig=px.line(
-        (
-            df
-            .select(
-                pl.col('DATE', '2020','2021', '2022', '2023', '2024')
-            )
-         ),
+    fig=line_figure(   # same as px.line, columns go to the traces as they are
+        df,
         'DATE',
         ['2024','2023', '2022', '2021', '2020'],
         template='simple_white',
@@ -64,8 +67,7 @@ def plot_by_year(
 
 
 df_all = (
-    pl.scan_csv('MTA_Daily_Ridership_Data__Beginning_2020.csv',
-    )
+    scan_dataset('mta', 'MTA_Daily_Ridership_Data__Beginning_2020.csv')
     .with_columns(
         DATE = pl.col('Date').str.to_datetime('%m/%d/%Y')
     )
@@ -92,7 +94,7 @@ df_all = (
             'Staten Island Railway: % of Comparable Pre-Pandemic Day'   : 'SI_RW_PCT',
         }
     )
-    .with_columns(cs.ends_with('_PCT').cast(pl.Float32)/100)
+    .with_columns(cs.ends_with('_PCT')/100)   # Float32 as declared
     .select(
         pl.col(
             'DATE', 'MONTH_NUM', 'MONTH_NAME', 'DAY', 'DAY_NAME', 'YEAR', 
@@ -103,6 +105,8 @@ df_all = (
     )
     .collect()
 )
+# month and day names are joined and concatenated as text below
+df_all = shrink(df_all, 'MTA ridership', exclude=['MONTH_NAME', 'DAY_NAME'])
 
 df_subway = (
     df_all
@@ -1,3 +1,6 @@
+import sys
+from pathlib import Path
+
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -7,13 +10,18 @@ import polars.selectors as cs
 
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from frame_shrink import shrink
+from frame_traces import column_array, trace_columns
+
 degree = 5  # used for curve fitting
 
 #
 #   MAKE DATAFRAMES
 #
 df_python = (  # df python is used for scatter plot
-    pl.scan_csv('merged_snake_data.csv')
+    scan_dataset('snakes', 'merged_snake_data.csv')
     # when Common Name is missing, use value from Binomial column 
     .with_columns(
         pl.when(pl.col('Common Name').is_null())
@@ -34,6 +42,7 @@ df_python = (  # df python is used for scatter plot
     .sort('TBL cm', descending=False)
     .collect()
 )
+df_python = shrink(df_python, 'pythons')
 
 # df_python_longest used for pareto chart showing world's longest pythons
 df_python_longest = (
@@ -64,8 +73,7 @@ fig = make_subplots(
 #
 fig.add_trace(
     go.Bar(
-        x=df_python_longest['TBL cm'],  
-        y=df_python_longest['Common Name'],
+        **trace_columns(df_python_longest, x='TBL cm', y='Common Name'),
         orientation='h',
         hovertemplate = None,
         hoverinfo = 'skip',
@@ -79,20 +87,21 @@ fig.update_xaxes(title_text='Length (cm)', row=1, col=1)
 #
 
 #   Create best fit data to overlay on scatter
-x = df_python['TBL cm']
-y = df_python['Weight gr']
+x = column_array(df_python['TBL cm'])
+y = column_array(df_python['Weight gr'])
 # least squares polynomial fit, 
 coefs = np.polyfit(x, y, degree)
-best_fit_x = np.linspace(min(x), max(x), num=np.size(x))
+best_fit_x = np.linspace(x.min(), x.max(), num=np.size(x))
 best_fit_y = np.polyval(coefs, best_fit_x)
 
 fig.add_trace(
     go.Scatter(
-        x=df_python['TBL cm'],
-        y=df_python['Weight gr'],
+        **trace_columns(
+            df_python, x='TBL cm', y='Weight gr',
+            customdata=['Common Name', 'TBL cm', 'FEET', 'INCHES', 'Weight gr', 'POUNDS']
+        ),
         mode='markers',
         marker=dict(color='green'),
-        customdata=df_python[['Common Name', 'TBL cm', 'FEET', 'INCHES', 'Weight gr', 'POUNDS']],
         hovertemplate=(
             '<b>%{customdata[0]}</b><br>' +
             'Length: %{customdata[1]} cm ' +
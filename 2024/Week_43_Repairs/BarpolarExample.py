@@ -1,10 +1,18 @@
 # Import libraries
+import sys
+from pathlib import Path
+
 import plotly.graph_objects as go
 import pandas as pd
 
-df = pd.read_csv(
-    'OpenRepair_Data_RepairCafeInt_202407.csv',
-    low_memory=False
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+
+# declared types, no low_memory type guessing of mixed columns
+df = (
+    scan_dataset('open_repair', 'OpenRepair_Data_RepairCafeInt_202407.csv')
+    .collect()
+    .to_pandas()
 )
 # only one records = 'Unknown'
 df = df[df['repair_status']!='Unknown']
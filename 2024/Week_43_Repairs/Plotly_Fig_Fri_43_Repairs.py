@@ -1,29 +1,36 @@
+import sys
+from pathlib import Path
+
 import polars as pl
 import plotly.express as px
 import pycountry
-pl.show_versions()
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from frame_shrink import shrink
+
+# constants
+SHOW_VERSIONS = False  # if True, print polars & dependency versions, slow
+
+if SHOW_VERSIONS:   # diagnostic only, walks every optional dependency
+    pl.show_versions()
 
 #------------------------------------------------------------------------------#
 #  MAP COUNTRY ABBREVIATIONS TO FULL NAMES, USING PYCOUNTRY LIBRARY            #
 #------------------------------------------------------------------------------#
-df_countries = (
-    pl.DataFrame(
-        dict(
-            zip(
-                [c.name for c in pycountry.countries],
-                [c.alpha_3 for c in pycountry.countries]
-            )
-        )
-    )
-    .transpose(include_header=True)
-    .rename({'column': 'COUNTRY', 'column_0': 'CTRY_ABBR'})
+df_countries = pl.DataFrame(
+    {
+        'COUNTRY'   : [c.name for c in pycountry.countries],
+        'CTRY_ABBR' : [c.alpha_3 for c in pycountry.countries],
+    }
 )
 
 #------------------------------------------------------------------------------#
 #  READ DATA SET, TWEAK AND CLEAN FOR THIS EXERECISE                           #
 #------------------------------------------------------------------------------#
 df = (
-    pl.read_csv('OpenRepair_Data_RepairCafeInt_202407.csv')
+    scan_dataset('open_repair', 'OpenRepair_Data_RepairCafeInt_202407.csv')
+    .collect()
     .rename({'country': 'CTRY_ABBR'})
     .join(
         df_countries,
@@ -49,7 +56,7 @@ df = (
 # shift country name and abbr to left side of dataframe, drop first col
 left_cols = ['COUNTRY', 'CTRY_ABBR']
 reordered_cols = left_cols + [c for c in df.columns[1:] if c not in left_cols]
-df = df[reordered_cols]
+df = shrink(df[reordered_cols], 'repairs')
 
 #------------------------------------------------------------------------------#
 #  PREPARE DATAFRAME FOR SCATTER PLOTS                                         #
@@ -0,0 +1,44 @@
+import plotly.express as px
+
+from election_data import get_turnout_by_state
+from geo_cache import get_geojson, drop_frame_geojson
+
+#------------------------------------------------------------------------------#
+#  Mean turnout by year and state. Counties with turnout of inf get the mean   #
+#  of their year and state, no hard coded row numbers needed                   #
+#------------------------------------------------------------------------------#
+gr_turnout = get_turnout_by_state()
+# gr_turnout = get_turnout_by_state('data/federal_cty_unharm.csv')
+
+
+# This repo is where I've found the GeoJson for Germany. It's worth mentioning!
+# https://github.com/isellsoap/deutschlandGeoJSON/blob/main/README.md
+# https://github.com/isellsoap/deutschlandGeoJSON/blob/main/2_bundeslaender/2_hoch.geo.json
+
+#------------------------------------------------------------------------------#
+#  GeoJson is simplified, quantized and renamed to the English state names of  #
+#  the data once, then read from data/geo_cache on every later run             #
+#------------------------------------------------------------------------------#
+# This is my local repo: 'data/...'
+data2 = get_geojson('data/Germany_geo.json')
+
+avg_turnout = gr_turnout['turnout'].mean()
+
+fig_map2 = px.choropleth(
+    gr_turnout,
+    geojson=data2,
+    featureidkey='properties.name',
+    color='turnout',
+    range_color=(0.6, 1),
+    color_continuous_scale=px.colors.diverging.BrBG,
+    color_continuous_midpoint=avg_turnout,
+    locations='state_name',
+    scope='europe',
+    labels={'turnout': 'Turnout prop'},
+    animation_frame='year',
+    height=600, width=600
+)
+# each year frame had its own copy of the geojson, first trace copy is enough
+drop_frame_geojson(fig_map2)
+fig_map2.update_geos(fitbounds='locations', visible=False)
+fig_map2.show()
@@ -0,0 +1,66 @@
+'''
+Benchmark choropleth html size and build time, full resolution geojson with a
+copy in every animation frame, versus the simplified geojson from geo_cache.
+Turnout values are random, only the geometry matters for this comparison.
+'''
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from geo_cache import GEO_SOURCE, build_geojson, drop_frame_geojson
+
+# constants
+YEARS = list(range(1990, 2022, 4))   # 8 frames, like the federal elections
+rng = np.random.default_rng(44)
+
+def random_turnout(state_names):
+    ''' one random turnout per state and election year '''
+    return pd.DataFrame(
+        {
+            'year': np.repeat(YEARS, len(state_names)),
+            'state_name': state_names * len(YEARS),
+            'turnout': rng.uniform(0.6, 0.9, len(YEARS) * len(state_names)),
+        }
+    )
+
+def build(df, geojson, drop_frames):
+    ''' choropleth as in the weekly script, returns seconds and html bytes '''
+    start = time.perf_counter()
+    fig = px.choropleth(
+        df,
+        geojson=geojson,
+        featureidkey='properties.name',
+        color='turnout',
+        locations='state_name',
+        animation_frame='year',
+    )
+    if drop_frames:
+        drop_frame_geojson(fig)
+    fig.update_geos(fitbounds='locations', visible=False)
+    html = fig.to_html(include_plotlyjs=False, full_html=False)
+    return time.perf_counter() - start, len(html.encode())
+
+#------------------------------------------------------------------------------#
+#     run the benchmark, print results                                         #
+#------------------------------------------------------------------------------#
+with open(GEO_SOURCE, encoding='utf-8') as f:
+    geo_full = json.load(f)
+
+start = time.perf_counter()
+geo_small = build_geojson(geo_full)
+print(f'simplify + quantize: {time.perf_counter() - start:.3f} s (once per cache)')
+
+german_names = [f['properties']['name'] for f in geo_full['features']]
+english_names = [f['properties']['name'] for f in geo_small['features']]
+df_german = random_turnout(german_names)
+df_english = random_turnout(english_names)
+
+for label, df, geojson, drop_frames in [
+        ('full geojson, copy per frame', df_german, geo_full, False),
+        ('cached geojson, first trace only', df_english, geo_small, True),
+        ]:
+    seconds, html_bytes = build(df, geojson, drop_frames)
+    print(f'{label:34} {seconds:6.3f} s {html_bytes / 1e6:8.2f} MB')
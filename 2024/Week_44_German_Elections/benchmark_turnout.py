@@ -0,0 +1,67 @@
+'''
+Benchmark the turnout aggregation on a county level dataset of many elections,
+pandas (read everything, fix inf, group by) versus the lazy polars pipeline of
+election_data. Without a source, a random dataset the size of the harmonized
+county files (400 counties x 20 elections x 30 columns) is written first.
+'''
+import glob
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from election_data import get_turnout_by_state
+
+# constants
+bench_csv = 'data/benchmark_cty_turnout.csv'
+COUNTIES = 400
+ELECTIONS = list(range(1949, 2025, 4))
+EXTRA_COLUMNS = 27    # party vote columns, ignored by the aggregation
+rng = np.random.default_rng(44)
+
+def write_random_csv(path):
+    ''' county x election rows, turnout with a few inf values '''
+    n = COUNTIES * len(ELECTIONS)
+    turnout = rng.uniform(0.6, 0.9, n)
+    turnout[rng.choice(n, 20, replace=False)] = np.inf
+    df = pl.DataFrame(
+        {
+            'year': np.repeat(ELECTIONS, COUNTIES),
+            'state_name': rng.choice(
+                ['Bavaria', 'Hesse', 'Saxony', 'Berlin', 'Bremen'], n),
+            'county': np.tile(np.arange(COUNTIES), len(ELECTIONS)),
+            'turnout': turnout,
+        }
+        | {f'party_{i}': rng.uniform(0, 1, n) for i in range(EXTRA_COLUMNS)}
+    )
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    df.write_csv(path)
+
+def pandas_turnout(source):
+    ''' notebook approach, with generic inf fix instead of hard coded rows '''
+    df = pd.concat([pd.read_csv(f) for f in sorted(glob.glob(source))])
+    finite = np.isfinite(df['turnout'])
+    group_mean = (
+        df['turnout'].where(finite)
+        .groupby([df['year'], df['state_name']]).transform('mean')
+    )
+    df['turnout'] = df['turnout'].where(finite, group_mean)
+    return df.groupby(by=['year', 'state_name'])[['turnout']].mean().reset_index()
+
+#------------------------------------------------------------------------------#
+#     run the benchmark, print results                                         #
+#------------------------------------------------------------------------------#
+if len(sys.argv) > 1:
+    source = sys.argv[1]     # csv file or glob of county level files
+else:
+    source = bench_csv
+    write_random_csv(source)
+
+for label, turnout_fn in [('pandas', pandas_turnout),
+                          ('polars lazy', get_turnout_by_state)]:
+    start = time.perf_counter()
+    result = turnout_fn(source)
+    print(f'{label:12} {time.perf_counter() - start:6.3f} s  {len(result)} rows')
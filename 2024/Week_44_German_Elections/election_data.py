@@ -0,0 +1,50 @@
+'''
+Lazy polars pipeline for average turnout by election year and state.
+
+Some counties have turnout of inf (zero eligible voters in the extract). These
+are replaced by the mean of the finite turnout values of the same year and
+state, and the aggregation runs in the same lazy query. Only the 3 needed
+columns are read, so the same code works on one csv, or a glob over all the
+county level files like 'data/federal_cty_*.csv'.
+'''
+import polars as pl
+
+# constants
+csv_source = (  # file name split over 2 lines, PEP-8
+    'https://raw.githubusercontent.com/plotly/Figure-Friday/refs/heads/' +
+    'main/2024/week-44/federal_cty_unharm.csv'
+)
+
+def scan_turnout(source=csv_source):
+    ''' lazyframe of year, state_name and turnout with inf/null imputed '''
+    return (
+        pl.scan_csv(
+            source,
+            schema_overrides={
+                'year'       : pl.Int16,
+                'state_name' : pl.String,
+                'turnout'    : pl.Float64,
+            },
+        )
+        .select('year', 'state_name', 'turnout')
+        .with_columns(
+            turnout = pl.when(pl.col('turnout').is_finite())
+                .then(pl.col('turnout'))
+                .otherwise(
+                    pl.col('turnout')
+                    .filter(pl.col('turnout').is_finite())
+                    .mean()
+                    .over('year', 'state_name')
+                )
+        )
+    )
+
+def get_turnout_by_state(source=csv_source):
+    ''' mean turnout by year and state, as a polars dataframe '''
+    return (
+        scan_turnout(source)
+        .group_by('year', 'state_name')
+        .agg(pl.col('turnout').mean())
+        .sort('year', 'state_name')
+        .collect()
+    )
@@ -0,0 +1,148 @@
+'''
+Simplified and quantized GeoJSON cache for the German states choropleth.
+
+The high resolution boundaries (2_hoch.geo.json from the deutschlandGeoJSON
+repo) are several MB, and px.choropleth writes all of it into the html. This
+module simplifies each ring with Douglas-Peucker to a tolerance in degrees,
+rounds coordinates to a fixed number of digits, and renames the states from
+German to the English names used in federal_cty_unharm.csv. The result is
+cached as json, keyed by a hash of the source file, the tolerance and digits,
+so the work is done once per source file and setting.
+'''
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+# constants
+GEO_SOURCE = 'data/Germany_geo.json'
+CACHE_DIR = 'data/geo_cache'
+TOLERANCE = 0.005   # degrees, about 350 m east-west and 550 m north-south
+DIGITS = 3          # decimal places of each coordinate after quantization
+
+# GeoJSON has German names, data has English names. Only 7 of 16 are different
+mapping_states = {
+    'Bavaria': 'Bayern',
+    'Hesse': 'Hessen',
+    'North Rhine-Westphalia': 'Nordrhein-Westfalen',
+    'Rhineland-Palatinate': 'Rheinland-Pfalz',
+    'Saxony': 'Sachsen',
+    'Saxony-Anhalt': 'Sachsen-Anhalt',
+    'Thuringia': 'Thüringen',
+}
+
+#------------------------------------------------------------------------------#
+#     geometry                                                                 #
+#------------------------------------------------------------------------------#
+def simplify_line(points, tolerance):
+    ''' Douglas-Peucker, returns boolean mask of the points to keep '''
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        # distance of all inner points to the start-end chord, in one pass
+        a, b = points[start], points[end]
+        inner = points[start + 1:end]
+        chord = b - a
+        chord_len = np.hypot(*chord)
+        if chord_len == 0:  # closed ring, distance to the start point
+            dist = np.hypot(*(inner - a).T)
+        else:
+            offset = inner - a
+            dist = np.abs(
+                chord[0] * offset[:, 1] - chord[1] * offset[:, 0]) / chord_len
+        i_max = int(np.argmax(dist))
+        if dist[i_max] > tolerance:
+            split = start + 1 + i_max
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+def simplify_ring(ring, tolerance, digits):
+    ''' simplify and quantize one closed ring, at least 4 points kept '''
+    points = np.asarray(ring, dtype=np.float64)
+    if len(points) > 4:
+        simplified = points[simplify_line(points, tolerance)]
+        if len(simplified) >= 4:
+            points = simplified
+    points = np.round(points, digits)
+    # quantizing can make neighbor points identical, drop the repeats
+    repeat = np.r_[False, np.all(points[1:] == points[:-1], axis=1)]
+    points = points[~repeat]
+    if len(points) < 4:
+        return None
+    return points.tolist()
+
+def simplify_geometry(geometry, tolerance, digits):
+    ''' simplify Polygon or MultiPolygon, drops rings that collapse, keeps the
+        original geometry if nothing is left, so no feature loses its shape '''
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    else:
+        polygons = geometry['coordinates']
+
+    new_polygons = []
+    for polygon in polygons:
+        rings = [simplify_ring(ring, tolerance, digits) for ring in polygon]
+        if rings[0] is None:   # outer ring collapsed, tiny island
+            continue
+        new_polygons.append([r for r in rings if r is not None])
+    if not new_polygons:
+        return geometry
+
+    if geometry['type'] == 'Polygon':
+        return {'type': 'Polygon', 'coordinates': new_polygons[0]}
+    return {'type': 'MultiPolygon', 'coordinates': new_polygons}
+
+#------------------------------------------------------------------------------#
+#     cache                                                                    #
+#------------------------------------------------------------------------------#
+def cache_key(source_bytes, tolerance, digits):
+    ''' file name of cache, from source hash and simplification settings '''
+    source_hash = hashlib.sha256(source_bytes).hexdigest()[:16]
+    return f'{source_hash}_tol{tolerance:g}_d{digits}.json'
+
+def build_geojson(geojson, tolerance=TOLERANCE, digits=DIGITS,
+                  rename=mapping_states):
+    ''' simplified, quantized copy of geojson with english state names '''
+    german_to_english = {v: k for k, v in rename.items()}
+    features = []
+    for feature in geojson['features']:
+        name = feature['properties']['name']
+        features.append(
+            {
+                'type': 'Feature',
+                'properties': {'name': german_to_english.get(name, name)},
+                'geometry': simplify_geometry(
+                    feature['geometry'], tolerance, digits),
+            }
+        )
+    return {'type': 'FeatureCollection', 'features': features}
+
+def get_geojson(source=GEO_SOURCE, tolerance=TOLERANCE, digits=DIGITS,
+                cache_dir=CACHE_DIR):
+    ''' return simplified geojson, from cache if this source was seen before '''
+    source_bytes = Path(source).read_bytes()
+    cache_file = Path(cache_dir) / cache_key(source_bytes, tolerance, digits)
+    if cache_file.exists():
+        with open(cache_file, encoding='utf-8') as f:
+            return json.load(f)
+
+    geojson = build_geojson(json.loads(source_bytes), tolerance, digits)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        # compact separators, no spaces add up over thousands of coordinates
+        json.dump(geojson, f, separators=(',', ':'), ensure_ascii=False)
+    return geojson
+
+def drop_frame_geojson(fig):
+    ''' animation frames reuse the geojson of the first trace, remove copies '''
+    for frame in fig.frames:
+        for trace in frame.data:
+            trace.geojson = None
+    return fig
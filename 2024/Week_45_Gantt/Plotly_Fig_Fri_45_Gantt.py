@@ -1,7 +1,14 @@
+import sys
 from datetime import datetime
+from pathlib import Path
 import polars as pl
 import plotly.express as px
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from frame_shrink import shrink
+from gantt_timeline import timeline_rows, apply_row_axis
+
 # constants
 MIN_YEARS = 25  # gantt chart includes mines with MIN_YEARS or more of service
 SOURCE_LOCAL = False # if True, data from csv, if False data from get git-repo
@@ -14,7 +21,7 @@ local_csv = 'week_45_data.csv'
 if SOURCE_LOCAL:
     # this path reads data previously saved to local drive
     df_source = (
-        pl.scan_csv(local_csv, ignore_errors=True)
+        scan_dataset('mines', local_csv)   # years as Int16, like the web path
         .collect()
     )
 else:
@@ -65,88 +72,31 @@ df = (
 )
 
 #------------------------------------------------------------------------------#
-#     Use province names as section titles, indexed with integer-like values,
-#     1, 2, 3, etc. S. Section members are coal mines, with incremental index 
-#     values of 1.01, 1.02, etc. Each province group has a first row that will
-#     be formatted as a section head  
+#     Use province names as section titles. Each province group has a header
+#     row, then its coal mines by date opened. ROW is the position of each row
+#     on the y axis, GROUP_COUNT is 0 for the header and 1, 2, 3 for the mines
 #------------------------------------------------------------------------------#
-province_list = sorted(list(set(df['PROVINCE'])))
-# Add header row above the data of each province
-df_list = []
-for i, province in enumerate(province_list):
-    opened = ( # 1st row, opened is the earliest year opened
-        df     # of all coal mines in this province
-        .filter(pl.col('PROVINCE') == province)
-        .select(pl.col('DATE_OPENED'))
-        .min().to_series()[0]
-    )
-    closed = (  # closed is the last year closed of all coal mines
-        df      # in this province
-        .filter(pl.col('PROVINCE') == province)
-        .select(pl.col('DATE_CLOSED'))
-        .max().to_series()[0]
-    )
-    df_first_row = (   # here is the data frame for 1st row of province group
-        pl.DataFrame(
-            {
-                'COMPANY'      : '<b>' + province.upper() + '</b>',
-                'MINE'         : '',
-                'TOWN'         : '',
-                'PROVINCE'     : province,
-                'DATE_OPENED'  : opened,
-                'DATE_CLOSED'  : closed,
-                'YEAR_OPENED'  : opened.year,
-                'YEAR_CLOSED'  : closed.year,
-            }
-        )
-        .with_columns(pl.col('YEAR_OPENED', 'YEAR_CLOSED').cast(pl.Int16))
+df = (
+    timeline_rows(
+        df, 'PROVINCE', 'COMPANY', 'DATE_OPENED', 'DATE_CLOSED', MIN_YEARS)
+    .with_columns(
+        YEAR_OPENED = (pl.col('DATE_OPENED').dt.year().cast(pl.Int32)),
+        YEAR_CLOSED = (pl.col('DATE_CLOSED').dt.year().cast(pl.Int32))
     )
-    df_province = ( # finsh province group with concat of 1st row and all others
-        pl.concat(
-            [
-                df_first_row,
-                df
-                .filter(pl.col('PROVINCE') == province)
-                .sort('DATE_OPENED', descending=False)
-            ]
-        )
-        # temporary columns GROUP, GROUP_COUNT used for calculating item #
-        .with_columns(GROUP = pl.lit(i+1))
-        .with_columns(GROUP_COUNT = pl.col('GROUP').cum_count().over('GROUP') - 1)
-        .with_columns(ITEM = (   # ITEM serves a row index
-            pl.col('GROUP') + pl.col('GROUP_COUNT')/100.0).cast(pl.Float32()))
-        .with_columns(
-            ITEM_COMPANY = (
-                pl.lit('  ')  +  
-                pl.col('ITEM').cast(pl.Utf8).str.pad_end(4, '0')
-                + pl.lit(': ') 
-                + pl.col('COMPANY')
-            ),
-        )
-        .with_columns(
-            YEAR_OPENED = (pl.col('DATE_OPENED').dt.year().cast(pl.Int32)),
-            YEAR_CLOSED = (pl.col('DATE_CLOSED').dt.year().cast(pl.Int32))                                      
-        )
-        .with_columns(
-            DURATION_YEARS = (pl.col('YEAR_CLOSED') - pl.col('YEAR_OPENED'))
-        )
-        .with_columns(
-            MINE = pl.when(pl.col('MINE').is_null())
-                     .then(pl.lit('None'))
-                     .otherwise('MINE')
-        )
-        .with_columns(
-            TOWN = pl.when(pl.col('TOWN').is_null())
-                     .then(pl.lit('No Name Town'))
-                     .otherwise('TOWN')
-        )
-        .filter(pl.col('DURATION_YEARS') >= MIN_YEARS)
+    .with_columns(
+        MINE = pl.when(pl.col('IS_HEADER'))
+                 .then(pl.lit(''))
+                 .when(pl.col('MINE').is_null())
+                 .then(pl.lit('None'))
+                 .otherwise('MINE'),
+        TOWN = pl.when(pl.col('IS_HEADER'))
+                 .then(pl.lit(''))
+                 .when(pl.col('TOWN').is_null())
+                 .then(pl.lit('No Name Town'))
+                 .otherwise('TOWN'),
     )
-    # provinces need 2 or more rows, as first row is only a header
-    if len(df_province) > 1:
-        df_list.append(df_province)
-
-df = pl.concat(df_list)  # this is the final step of data frame creation
+)
+df = shrink(df, 'coal mines')
 
 #------------------------------------------------------------------------------#
 #     plolty timeline
@@ -157,7 +107,7 @@ fig = px.timeline(   # DATE_OPENED AND DATE_CLOSED are type Date
     df,
     x_start='DATE_OPENED',
     x_end='DATE_CLOSED',
-    y = 'ITEM_COMPANY',   # index has been prepended to COMPANY for sorting
+    y = 'ROW',   # integer row position, tick labels are set below
     title = my_title,
     height = 1400,
     width = 1000,
@@ -166,11 +116,10 @@ fig = px.timeline(   # DATE_OPENED AND DATE_CLOSED are type Date
                  'YEAR_OPENED', 'YEAR_CLOSED', 'DURATION_YEARS']
 )
 
-fig.update_yaxes(categoryorder='category descending', automargin=True)
+fig.update_yaxes(automargin=True)
 fig.update_layout(
     title=dict(font=dict(size=24), automargin=False, yref='paper'))
-fig.update_layout(
-    yaxis = dict( tickfont = dict(size=16), tickmode = 'linear', dtick=0.01))
+fig.update_layout(yaxis = dict( tickfont = dict(size=16)))
 fig.update_layout(xaxis = dict( tickfont = dict(size=16)))
 
 fig.update_layout(
@@ -181,19 +130,10 @@ fig.update_layout(
 )
 
 #------------------------------------------------------------------------------#
-#     Use list comprehension to find integer-like ITEM#s to use as group heads
+#     Company names as y labels, thick horiz line on each province group head.
+#     All lines and labels are added with one layout update
 #------------------------------------------------------------------------------#
-int_items = [
-    i for i, x in enumerate(df['ITEM'].sort(descending=True).to_list()) 
-    if x == round(x, 0)
-]
-for item_num in int_items:  # put thick horiz line on province group head
-    fig.add_hline(
-        y=item_num, 
-        line_width=10, 
-        line_color='black', 
-        layer='below'
-        )
+apply_row_axis(fig, df)
 
 #------------------------------------------------------------------------------#
 #     Add vertical line on today's date. Useful when using timeline for project
@@ -229,15 +169,5 @@ fig.update_layout(
     title_x=0
     )
 
-#------------------------------------------------------------------------------#
-#     fix y labels, for example '1.03 - Mine XYZ' becomes 'Mine XYZ'
-#------------------------------------------------------------------------------#
-y_ticks = df['ITEM_COMPANY']
-fig.update_yaxes(
-    tickmode='array',
-    tickvals=y_ticks,
-    ticktext=[y[7:] for y in y_ticks]  # strips away first 7 characters
-)
-
 fig.show()
 fig.write_html('Shuttered_Coal_Mines.html')
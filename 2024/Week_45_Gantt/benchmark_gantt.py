@@ -0,0 +1,92 @@
+'''
+Benchmark construction time of the grouped gantt timeline, 1k to 10k bars.
+The old way, as in the first version of Plotly_Fig_Fri_45_Gantt.py, has a
+string index in every y label, one fig.add_hline per group and tick text from
+a list comprehension. The new way uses gantt_timeline.py. Random mines, 20 per
+group, stand in for charting every commodity.
+'''
+import time
+from datetime import date
+
+import numpy as np
+import polars as pl
+import plotly.express as px
+
+from gantt_timeline import timeline_rows, apply_row_axis
+
+# constants
+BARS = [1_000, 2_000, 5_000, 10_000]
+PER_GROUP = 20   # the old string index allows 99 mines per group at most
+
+def random_mines(n_bars):
+    ''' n_bars mines with random company, group and years '''
+    rng = np.random.default_rng(45)
+    opened = rng.integers(1900, 1990, n_bars)
+    return pl.DataFrame(
+        {
+            'COMPANY': [f'Company {i}' for i in range(n_bars)],
+            'GROUP_NAME': [f'Group {i // PER_GROUP:04d}' for i in range(n_bars)],
+            'DATE_OPENED': [date(y, 1, 1) for y in opened],
+            'DATE_CLOSED': [date(y, 1, 1) for y in opened + rng.integers(1, 60, n_bars)],
+        }
+    )
+
+def build_old(df):
+    ''' string index per row, add_hline per group, list comprehension ticks '''
+    df_items = (
+        timeline_rows(df, 'GROUP_NAME', 'COMPANY', 'DATE_OPENED', 'DATE_CLOSED')
+        .with_columns(
+            ITEM = (pl.col('GROUP') + pl.col('GROUP_COUNT') / 100.0).cast(pl.Float32)
+        )
+        .with_columns(
+            ITEM_COMPANY = (
+                pl.lit('  ')
+                + pl.col('ITEM').cast(pl.Utf8).str.pad_end(4, '0')
+                + pl.lit(': ')
+                + pl.col('COMPANY')
+            )
+        )
+    )
+    fig = px.timeline(
+        df_items, x_start='DATE_OPENED', x_end='DATE_CLOSED', y='ITEM_COMPANY',
+        color='GROUP_COUNT',
+    )
+    fig.update_yaxes(categoryorder='category descending')
+    int_items = [
+        i for i, x in enumerate(df_items['ITEM'].sort(descending=True).to_list())
+        if x == round(x, 0)
+    ]
+    for item_num in int_items:
+        fig.add_hline(y=item_num, line_width=10, line_color='black', layer='below')
+    y_ticks = df_items['ITEM_COMPANY']
+    fig.update_yaxes(
+        tickmode='array', tickvals=y_ticks, ticktext=[y[7:] for y in y_ticks])
+    return fig
+
+def build_new(df):
+    ''' integer ROW, tick text column, header lines in one layout update '''
+    df_rows = timeline_rows(df, 'GROUP_NAME', 'COMPANY', 'DATE_OPENED', 'DATE_CLOSED')
+    fig = px.timeline(
+        df_rows, x_start='DATE_OPENED', x_end='DATE_CLOSED', y='ROW',
+        color='GROUP_COUNT',
+    )
+    return apply_row_axis(fig, df_rows)
+
+#------------------------------------------------------------------------------#
+#     run the benchmark, print a table                                         #
+#------------------------------------------------------------------------------#
+rows = []
+for n_bars in BARS:
+    df = random_mines(n_bars)
+    for label, build in [('add_hline loop', build_old), ('batched', build_new)]:
+        start = time.perf_counter()
+        fig = build(df)
+        rows.append(
+            {
+                'BARS'    : n_bars,
+                'METHOD'  : label,
+                'SHAPES'  : len(fig.layout.shapes),
+                'SECONDS' : round(time.perf_counter() - start, 3),
+            }
+        )
+print(pl.DataFrame(rows))
@@ -0,0 +1,81 @@
+'''
+Grouped gantt rows, tick labels and separator lines built as whole columns.
+
+timeline_rows adds one header row per group and gives every row an integer
+ROW position, header first, then the members of the group by start date. The
+y axis of the timeline is ROW, so header positions and tick text are plain
+columns, no string index like '1.03: ' to sort by and strip off later, and no
+limit of 99 members per group. apply_row_axis sets the tick labels and the
+thick line on every header row with one layout update, instead of one
+fig.add_hline call per group, which re-validates the layout every time.
+'''
+import polars as pl
+
+# constants
+HEADER_LINE = dict(width=10, color='black')
+
+def timeline_rows(df, group_col, label_col, start_col, end_col, min_years=0):
+    ''' header row per group + member rows lasting min_years or more '''
+    df = df.with_columns(
+        DURATION_YEARS = (pl.col(end_col).dt.year() - pl.col(start_col).dt.year())
+    )
+    # header spans the first start to the last end of all group members
+    df_headers = (
+        df
+        .group_by(group_col)
+        .agg(pl.col(start_col).min(), pl.col(end_col).max())
+        .with_columns(
+            (pl.lit('<b>') + pl.col(group_col).str.to_uppercase() + pl.lit('</b>'))
+                .alias(label_col),
+            DURATION_YEARS = (
+                pl.col(end_col).dt.year() - pl.col(start_col).dt.year()),
+            IS_HEADER = pl.lit(True),
+        )
+    )
+    df_members = (
+        df
+        .filter(pl.col('DURATION_YEARS') >= min_years)
+        .with_columns(IS_HEADER = pl.lit(False))
+    )
+    return (
+        pl.concat(
+            [   # only groups that still have members after the filter
+                df_headers.filter(
+                    pl.col(group_col).is_in(df_members[group_col].implode())),
+                df_members,
+            ],
+            how='diagonal',
+        )
+        .sort(group_col, 'IS_HEADER', start_col, descending=[False, True, False])
+        .with_columns(
+            ROW = pl.int_range(pl.len(), dtype=pl.Int32),
+            GROUP = pl.col(group_col).rank('dense').cast(pl.Int32),
+            # 0 for the header, 1, 2, 3 ... for group members
+            GROUP_COUNT = pl.int_range(pl.len(), dtype=pl.Int32).over(group_col),
+            TICK_TEXT = pl.col(label_col),
+        )
+    )
+
+def header_shapes(df_rows, line=HEADER_LINE):
+    ''' list of full-width line shapes, one on each header row '''
+    return [
+        dict(
+            type='line', layer='below', line=line,
+            xref='x domain', x0=0, x1=1,
+            yref='y', y0=row, y1=row,
+        )
+        for row in df_rows.filter(pl.col('IS_HEADER'))['ROW']
+    ]
+
+def apply_row_axis(fig, df_rows, line=HEADER_LINE):
+    ''' ticks, reversed rows and header lines in one layout update '''
+    fig.update_layout(
+        shapes=list(fig.layout.shapes) + header_shapes(df_rows, line),
+        yaxis=dict(
+            tickmode='array',
+            tickvals=df_rows['ROW'].to_numpy(),
+            ticktext=df_rows['TICK_TEXT'].to_numpy(),
+            autorange='reversed',   # first row at the top
+        ),
+    )
+    return fig
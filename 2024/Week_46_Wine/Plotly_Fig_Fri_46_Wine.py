@@ -1,8 +1,17 @@
+import sys
+from pathlib import Path
+
 import plotly.express as px
 import polars as pl
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from frame_shrink import shrink
+from violin_stats import make_violin_fig
+
 # constants
 SOURCE_LOCAL = True # if True, data from csv, if False data from get git-repo
+PRECOMPUTED_VIOLINS = True  # if True, KDE & quartiles computed here, not in browser
 csv_local = 'week_46_data.csv'
 
 csv_git_source = 'https://raw.githubusercontent.com/plotly/Figure-Friday/refs/'
@@ -18,7 +27,7 @@ wine_colors = {
 #     initialize dataframe df_source from local file or git repo
 #------------------------------------------------------------------------------#
 if SOURCE_LOCAL:   # read cleand-up data from local directory
-    df = pl.read_csv(csv_local)       
+    df = scan_dataset('wine', csv_local).collect()
 else:             # read source data from git_repo, and clean-up
     df = (
         pl.read_csv(csv_git_source)
@@ -38,21 +47,34 @@ else:             # read source data from git_repo, and clean-up
     )
     df.write_csv(csv_local)
     df.head()
+df = shrink(df, 'wines')
 
-fig = px.violin(
-    df,
-    x='Color',
-    y='Max_yield_hl',
-    facet_col='COUNTRY',
-    title = (
-        'Maximum permitted wine yield (hectoliters per hectare) in France and Italy'
-        '<a href="https://en.wikipedia.org/wiki/Yield_(wine)" ' + 
-        'style="color:yellow;"> Wikipedia LINK</a>'
-    ),
-    color='Color', 
-    color_discrete_map=wine_colors,
-    template='plotly_dark',
+my_title = (
+    'Maximum permitted wine yield (hectoliters per hectare) in France and Italy'
+    '<a href="https://en.wikipedia.org/wiki/Yield_(wine)" ' + 
+    'style="color:yellow;"> Wikipedia LINK</a>'
 )
+if PRECOMPUTED_VIOLINS:   # html size does not grow with the data set
+    fig = make_violin_fig(
+        df,
+        x='Color',
+        y='Max_yield_hl',
+        facet_col='COUNTRY',
+        color_discrete_map=wine_colors,
+        title=my_title,
+        template='plotly_dark',
+    )
+else:                     # every Max_yield_hl value goes into the html
+    fig = px.violin(
+        df,
+        x='Color',
+        y='Max_yield_hl',
+        facet_col='COUNTRY',
+        title = my_title,
+        color='Color', 
+        color_discrete_map=wine_colors,
+        template='plotly_dark',
+    )
 
 fig.update_layout(
     font=dict(size=16), 
@@ -0,0 +1,72 @@
+'''
+Benchmark html size and time of the wine yield violins, px.violin with every
+data point versus precomputed KDE curves and quartiles. The PDO data is
+repeated up to 100 times, with a little noise, to stand in for a growing data
+set. PARSE_SECONDS is the time to decode the figure json, a stand-in for the
+work the browser does on load before plotly.js draws the violins.
+'''
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import plotly.express as px
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from violin_stats import make_violin_fig
+
+# constants
+COPIES = [1, 10, 100]   # copies of week_46_data.csv
+wine_colors = {'Rosé': '#E3AFA7', 'Red': '#9B2242', 'White': '#E7DF99'}
+
+df_pdo = pl.read_csv('week_46_data.csv').select('COUNTRY', 'Color', 'Max_yield_hl')
+
+def repeat_data(n_copies):
+    ''' n copies of the data, yields shifted by -2 to +2 hl so KDEs change '''
+    rng = np.random.default_rng(46)
+    df = pl.concat([df_pdo] * n_copies)
+    return df.with_columns(
+        pl.col('Max_yield_hl') + pl.Series(rng.integers(-2, 3, len(df)))
+    )
+
+def build_px(df):
+    ''' px.violin of every data point, as in the original script '''
+    return px.violin(
+        df, x='Color', y='Max_yield_hl', facet_col='COUNTRY',
+        color='Color', color_discrete_map=wine_colors, template='plotly_dark',
+    )
+
+def build_precomputed(df):
+    ''' violins from precomputed KDE curves and quartiles '''
+    return make_violin_fig(
+        df, x='Color', y='Max_yield_hl', facet_col='COUNTRY',
+        color_discrete_map=wine_colors, template='plotly_dark',
+    )
+
+#------------------------------------------------------------------------------#
+#     run the benchmark, print a table                                         #
+#------------------------------------------------------------------------------#
+rows = []
+for n_copies in COPIES:
+    df = repeat_data(n_copies)
+    for label, build in [('px.violin', build_px), ('precomputed', build_precomputed)]:
+        start = time.perf_counter()
+        fig = build(df)
+        html = fig.to_html(include_plotlyjs=False, full_html=False)
+        build_seconds = time.perf_counter() - start
+
+        fig_json = fig.to_json()
+        start = time.perf_counter()
+        json.loads(fig_json)
+        rows.append(
+            {
+                'ROWS'          : len(df),
+                'METHOD'        : label,
+                'BUILD_SECONDS' : round(build_seconds, 3),
+                'PARSE_SECONDS' : round(time.perf_counter() - start, 4),
+                'HTML_KB'       : round(len(html.encode()) / 1024, 1),
+            }
+        )
+print(pl.DataFrame(rows))
@@ -0,0 +1,40 @@
+'''
+Benchmark the words and places index of ufo_index.py against full scans of
+scrubbed.csv: build time, then the time and number of ids of a few keyword and
+bounding box queries, each checked against the same filter on the frame.
+'''
+import sys
+import time
+from pathlib import Path
+
+import polars as pl
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from dataset_schemas import scan_dataset
+from ufo_index import CSV_PATH, INDEX_PATH, build_ufo_index, query_ids
+
+start = time.perf_counter()
+index = build_ufo_index()
+print(f'built {INDEX_PATH} in {time.perf_counter() - start:.3f} s, '
+      f'{len(index["tokens"]):,} words, {len(index["point_ids"]):,} places')
+
+# the same queries as full scans of the frame, to check and compare
+df = scan_dataset('ufo', CSV_PATH).with_row_index('ID').collect()
+queries = [
+    ('disk', None, pl.col('comments').str.to_lowercase().str.contains(r'\bdisk\b')),
+    ('triangle', None, pl.col('comments').str.to_lowercase().str.contains(r'\btriangle\b')),
+    (None, (32, -125, 49, -104),
+        pl.col('latitude').is_between(32, 49) & pl.col('longitude ').is_between(-125, -104)),
+    ('triangle', (32, -125, 49, -104),
+        pl.col('comments').str.to_lowercase().str.contains(r'\btriangle\b')
+        & pl.col('latitude').is_between(32, 49) & pl.col('longitude ').is_between(-125, -104)),
+]
+for text, bbox, scan_filter in queries:
+    start = time.perf_counter()
+    ids = query_ids(index, text, bbox)
+    index_ms = 1000 * (time.perf_counter() - start)
+    start = time.perf_counter()
+    scan_ids = df.filter(scan_filter)['ID'].to_numpy()
+    scan_ms = 1000 * (time.perf_counter() - start)
+    print(f'{text!s:10} {bbox!s:22} {len(ids):6,} ids  index {index_ms:7.3f} ms  '
+          f'scan {scan_ms:7.3f} ms  {len(scan_ids):6,} ids')
@@ -0,0 +1,177 @@
+'''
+Keyword and map viewport index of the UFO sightings in scrubbed.csv.
+
+build_ufo_index reads scrubbed.csv once and saves two indexes in one .npz
+file, both as sorted arrays with offsets, so a query is a few binary searches
+and slices, never a scan of the ~80k comments:
+
+    words    every token of the comments, sorted, with the ids of the sightings
+             that use it: ids of a word are posting_ids[token_offsets[i]:
+             token_offsets[i + 1]], words of a prefix are one longer slice
+    places   sightings sorted by the GRID_DEGREES cell of their latitude and
+             longitude: a bounding box is one slice per row of cells, then an
+             exact test of the points in those slices
+
+Sighting ids are row numbers of scrubbed.csv, so df[ids] of the frame read by
+scan_dataset('ufo') gives the sightings to draw on the map.
+
+    index = get_ufo_index()
+    ids = query_ids(index, 'disk', bbox=(32, -125, 49, -104))
+'''
+import re
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from dataset_schemas import scan_dataset   # Fig_Fri_Tools, on sys.path of the caller
+
+# constants
+CSV_PATH = 'scrubbed.csv'
+INDEX_PATH = 'ufo_index.npz'
+GRID_DEGREES = 1.0   # cell size of the places index, ~100 km
+TOKEN_PATTERN = r'[a-z0-9]+'
+ESCAPE_PATTERN = r'&#\d+;?'   # the file has , ' ! as &#44 &#39 &#33
+
+#------------------------------------------------------------------------------#
+#     build and load                                                           #
+#------------------------------------------------------------------------------#
+def comment_tokens(comments_col='comments'):
+    ''' expression, list of lower case words of a comment '''
+    return (
+        pl.col(comments_col)
+        .str.replace_all(ESCAPE_PATTERN, ' ')
+        .str.to_lowercase()
+        .str.extract_all(TOKEN_PATTERN)
+    )
+
+def grid_position(values, lowest, grid_degrees, n_cells):
+    ''' row or column of the grid of each latitude or longitude '''
+    return np.clip(((values - lowest) // grid_degrees).astype(np.int64), 0, n_cells - 1)
+
+def grid_cells(lat, lon, grid_degrees):
+    ''' cell number of each point, rows from the south pole, columns from -180 '''
+    n_rows, n_cols = round(180 / grid_degrees), round(360 / grid_degrees)
+    return (grid_position(lat, -90, grid_degrees, n_rows) * n_cols
+            + grid_position(lon, -180, grid_degrees, n_cols))
+
+def build_ufo_index(csv_path=CSV_PATH, index_path=INDEX_PATH, grid_degrees=GRID_DEGREES):
+    ''' save the words and places indexes, return loaded copy '''
+    df = (
+        scan_dataset('ufo', csv_path)
+        .select('comments', 'latitude', pl.col('longitude ').alias('longitude'))
+        .with_row_index('ID')
+        .collect()
+    )
+
+    # words: each token once per sighting, sorted by token then id
+    df_postings = (
+        df.select('ID', TOKEN=comment_tokens())
+        .explode('TOKEN')
+        .drop_nulls('TOKEN')
+        .unique()
+        .sort('TOKEN', 'ID')
+    )
+    df_tokens = df_postings.group_by('TOKEN', maintain_order=True).len()
+
+    # places: sightings with a valid position, sorted by grid cell
+    df_points = df.filter(
+        pl.col('latitude').is_between(-90, 90) & pl.col('longitude').is_between(-180, 180)
+    )
+    lat = df_points['latitude'].to_numpy()
+    lon = df_points['longitude'].to_numpy()
+    cells = grid_cells(lat, lon, grid_degrees)
+    order = np.argsort(cells, kind='stable')
+    n_cells = round(180 / grid_degrees) * round(360 / grid_degrees)
+
+    np.savez(
+        index_path,
+        tokens=df_tokens['TOKEN'].to_numpy().astype(str),
+        token_offsets=np.concatenate([[0], df_tokens['len'].cum_sum().to_numpy()]),
+        posting_ids=df_postings['ID'].to_numpy(),
+        cell_offsets=np.searchsorted(cells[order], np.arange(n_cells + 1)),
+        point_ids=df_points['ID'].to_numpy()[order],
+        point_lat=lat[order],
+        point_lon=lon[order],
+        grid_degrees=grid_degrees,
+        n_sightings=df.height,
+    )
+    return load_ufo_index(index_path)
+
+def load_ufo_index(index_path=INDEX_PATH):
+    ''' the saved arrays of both indexes, in a dict '''
+    with np.load(index_path) as npz:
+        index = dict(npz)
+    index['grid_degrees'] = float(index['grid_degrees'])
+    index['n_sightings'] = int(index['n_sightings'])
+    return index
+
+def get_ufo_index(csv_path=CSV_PATH, index_path=INDEX_PATH):
+    ''' load the index, rebuild it when missing or older than the csv '''
+    index_file = Path(index_path)
+    if (
+        not index_file.exists()
+        or
+        index_file.stat().st_mtime < Path(csv_path).stat().st_mtime
+    ):
+        return build_ufo_index(csv_path, index_path)
+    return load_ufo_index(index_path)
+
+#------------------------------------------------------------------------------#
+#     queries, sorted arrays of sighting ids                                   #
+#------------------------------------------------------------------------------#
+def word_ids(index, word, prefix=False):
+    ''' ids of sightings with word in the comments, or a word starting with it '''
+    tokens, offsets = index['tokens'], index['token_offsets']
+    first = np.searchsorted(tokens, word)
+    if prefix:   # tokens of a prefix are next to each other, one slice of postings
+        last = np.searchsorted(tokens, word + '\U0010ffff')
+        return np.unique(index['posting_ids'][offsets[first]:offsets[last]])
+    if first == len(tokens) or tokens[first] != word:
+        return index['posting_ids'][:0]
+    return index['posting_ids'][offsets[first]:offsets[first + 1]]
+
+def keyword_ids(index, text, match_all=True, prefix=False):
+    ''' ids of sightings with all (or any) words of text in the comments '''
+    words = re.findall(TOKEN_PATTERN, re.sub(ESCAPE_PATTERN, ' ', text).lower())
+    id_lists = [word_ids(index, word, prefix) for word in words]
+    if not id_lists:
+        return index['posting_ids'][:0]
+    combine = np.intersect1d if match_all else np.union1d
+    ids = id_lists[0]
+    for other in id_lists[1:]:
+        ids = combine(ids, other)
+    return ids
+
+def bbox_ids(index, south, west, north, east):
+    ''' ids of sightings in a map viewport, west > east crosses longitude 180 '''
+    grid = index['grid_degrees']
+    n_rows, n_cols = round(180 / grid), round(360 / grid)
+    row_first, row_last = grid_position(np.array([south, north]), -90, grid, n_rows)
+    lon_ranges = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+
+    # cells of a row are next to each other, one slice per row and longitude range
+    offsets = index['cell_offsets']
+    slices = [np.arange(0)]
+    for lon_range in lon_ranges:
+        col_first, col_last = grid_position(np.array(lon_range), -180, grid, n_cols)
+        slices += [
+            np.arange(offsets[row * n_cols + col_first], offsets[row * n_cols + col_last + 1])
+            for row in range(row_first, row_last + 1)
+        ]
+    candidates = np.concatenate(slices)
+
+    lat, lon = index['point_lat'][candidates], index['point_lon'][candidates]
+    in_lon = (lon >= west) & (lon <= east) if west <= east else (lon >= west) | (lon <= east)
+    inside = (lat >= south) & (lat <= north) & in_lon
+    return np.sort(index['point_ids'][candidates[inside]])
+
+def query_ids(index, text=None, bbox=None, match_all=True, prefix=False):
+    ''' ids matching keywords and a (south, west, north, east) bbox, both optional '''
+    ids = np.arange(index['n_sightings'])
+    if text is not None and text.strip():   # no words, no keyword filter
+        ids = keyword_ids(index, text, match_all, prefix)
+    if bbox is not None:
+        ids = np.intersect1d(ids, bbox_ids(index, *bbox), assume_unique=True)
+    return ids
+
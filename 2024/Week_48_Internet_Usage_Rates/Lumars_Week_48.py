@@ -1,27 +1,19 @@
-import pandas as pd
+import polars as pl
 import plotly.express as px
 import plotly.io as pio
 
-df = pd.read_csv("https://raw.githubusercontent.com/plotly/Figure-Friday/refs/heads/main/2024/week-48/API_IT.NET.USER.ZS_DS2_en_csv_v2_2160.csv")
-df.head()
+from wb_ranking import get_rankings
 
-melted_data = pd.melt(
-    df,
-    id_vars=['Country Name'],
-    var_name='Year',
-    value_name='Quantity'
-)
-
-melted_data['Year'] = pd.to_numeric(melted_data['Year'], errors='coerce')
-melted_data = melted_data.dropna(subset=['Year', 'Quantity'])
-print(melted_data)
+api_csv = 'API_IT.NET.USER.ZS_DS2_en_csv_v2_2160.csv'
 
-latest_year = melted_data['Year'].max()
-df_last_10_years = melted_data[melted_data['Year'] >= latest_year - 10]
+# Average of the last decade for each country, top 5 and bottom 5 by partial
+# sort. Regional and income group aggregates like 'World' are excluded with
+# the bundled Metadata_Country_ file, and only the last decade is read.
+top_5, bottom_5 = get_rankings(api_csv, k=5, span=10)
+print(top_5)
+print(bottom_5)
 
-average_quantity = df_last_10_years.groupby('Country Name')['Quantity'].mean().reset_index()
-
-average_quantity_sorted = average_quantity.sort_values('Quantity', ascending=False).head(5)
+average_quantity_sorted = top_5
 
 fig = px.bar(average_quantity_sorted, 
              x='Country Name', 
@@ -44,9 +36,7 @@ fig.update_layout(xaxis_tickangle=-45, yaxis=dict(range=[average_quantity_sorted
 
 fig.show()
 
-average_quantity_sorted = average_quantity.sort_values('Quantity', ascending=True).head(5)
-
-average_quantity_sorted['Quantity'] = average_quantity_sorted['Quantity'] / 100
+average_quantity_sorted = bottom_5.with_columns(pl.col('Quantity') / 100)
 
 fig2 = px.bar(average_quantity_sorted, 
               x='Country Name', 
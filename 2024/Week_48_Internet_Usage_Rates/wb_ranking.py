@@ -0,0 +1,92 @@
+'''
+Top-k and bottom-k country ranking for World Bank indicator files.
+
+Works with any API_<indicator>.csv file and its Metadata_Country_ file. Only
+the country columns and the year columns of the last decade are read, the
+regional and income group aggregates ('World', 'High income', ...) are
+excluded with the metadata, where aggregates have no Region, and the top and
+bottom countries come from a partial sort (numpy argpartition) instead of two
+full sorts.
+'''
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+# constants
+ID_COLS = ['Country Name', 'Country Code']
+
+def metadata_path(api_csv):
+    ''' Metadata_Country_ file that comes with an API_ indicator file '''
+    api_csv = Path(api_csv)
+    return api_csv.with_name('Metadata_Country_' + api_csv.name)
+
+def header_rows(api_csv):
+    ''' files from the website start with 4 rows of notes, bundled files don't '''
+    with open(api_csv, encoding='utf-8-sig') as f:
+        first_line = f.readline()
+    return 4 if first_line.startswith('"Data Source"') else 0
+
+def read_last_years(api_csv, span=10):
+    ''' country id columns + year columns from latest year with data - span '''
+    skip_rows = header_rows(api_csv)
+    year_cols = [
+        c for c in pl.scan_csv(api_csv, skip_rows=skip_rows).collect_schema()
+        if c.isdigit()
+    ]
+    # latest year with any data, read newest columns until one has values
+    df_lazy = pl.scan_csv(
+        api_csv,
+        skip_rows=skip_rows,
+        schema_overrides={c: pl.Float64 for c in year_cols},
+    )
+    latest = None
+    for c in reversed(year_cols):
+        if df_lazy.select(pl.col(c).is_not_null().any()).collect().item():
+            latest = int(c)
+            break
+    keep_years = [c for c in year_cols if latest - span <= int(c) <= latest]
+    return df_lazy.select(ID_COLS + keep_years).collect(), keep_years
+
+def country_codes(api_csv):
+    ''' codes of real countries, aggregates have no region in the metadata '''
+    return (
+        pl.scan_csv(metadata_path(api_csv))
+        .filter(pl.col('Region').is_not_null())
+        .select('Country Code')
+        .collect()
+        .to_series()
+    )
+
+def get_country_means(api_csv, span=10):
+    ''' mean of each country over the last span years, aggregates excluded '''
+    df, year_cols = read_last_years(api_csv, span)
+    return (
+        df
+        .filter(pl.col('Country Code').is_in(country_codes(api_csv).implode()))
+        .select(
+            pl.col(ID_COLS),
+            Quantity = pl.mean_horizontal(year_cols),  # nulls are skipped
+        )
+        .drop_nulls('Quantity')
+    )
+
+def top_k(df, k=5, col='Quantity', descending=True):
+    ''' k rows with highest (or lowest) col, partial sort, O(n) + O(k log k) '''
+    values = df[col].to_numpy()
+    if not descending:
+        values = -values
+    k = min(k, len(values))
+    if k == 0:
+        return df.clear()
+    idx = np.argpartition(-values, k - 1)[:k]  # k largest, unordered
+    idx = idx[np.argsort(-values[idx], kind='stable')]
+    return df[idx]
+
+def get_rankings(api_csv, k=5, span=10):
+    ''' top k and bottom k countries by mean over the last span years '''
+    df_means = get_country_means(api_csv, span)
+    return (
+        top_k(df_means, k, descending=True),
+        top_k(df_means, k, descending=False),
+    )
@@ -0,0 +1,167 @@
+'''
+Long format store for any number of World Bank indicator files.
+
+Each API_<indicator>.csv file is converted once to a long parquet file with
+columns COUNTRY_ID, YEAR and VALUE, in folder wb_store/INDICATOR=<code>/. The
+files are converted in parallel, and only again when the csv is newer than
+its parquet file. Metadata_Country_ files go to one countries.parquet table.
+
+COUNTRY_ID is the 3 letter country code as a base-26 number (ABW -> 48), so
+every file gets the same ids without a shared lookup table, and comparing
+indicators is a join on two small integer columns.
+'''
+import glob
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import polars as pl
+
+from wb_ranking import header_rows, metadata_path
+
+# constants
+STORE_DIR = 'wb_store'
+API_GLOB = 'API_*.csv'
+
+def country_id(code_col='Country Code'):
+    ''' expression, 3 letter code to UInt16, A=0 ... Z=25 in base 26 '''
+    letters = [
+        pl.col(code_col).str.slice(i, 1).str.encode('hex')
+        .str.to_integer(base=16) - ord('A')
+        for i in range(3)
+    ]
+    return (
+        (letters[0] * 26 * 26 + letters[1] * 26 + letters[2])
+        .cast(pl.UInt16)
+        .alias('COUNTRY_ID')
+    )
+
+def indicator_code(api_csv):
+    ''' indicator code from the file, like IT.NET.USER.ZS '''
+    return (
+        pl.scan_csv(api_csv, skip_rows=header_rows(api_csv))
+        .select(pl.col('Indicator Code').first())
+        .collect()
+        .item()
+    )
+
+#------------------------------------------------------------------------------#
+#     conversion, wide csv to long parquet                                     #
+#------------------------------------------------------------------------------#
+def convert_indicator(api_csv, store_dir=STORE_DIR):
+    ''' wide csv to long parquet, skipped if parquet is newer than the csv '''
+    code = indicator_code(api_csv)
+    out_file = Path(store_dir) / f'INDICATOR={code}' / 'data.parquet'
+    if out_file.exists() and out_file.stat().st_mtime >= Path(api_csv).stat().st_mtime:
+        return out_file
+
+    skip_rows = header_rows(api_csv)
+    year_cols = [
+        c for c in pl.scan_csv(api_csv, skip_rows=skip_rows).collect_schema()
+        if c.isdigit()
+    ]
+    df_long = (
+        pl.scan_csv(
+            api_csv,
+            skip_rows=skip_rows,
+            schema_overrides={c: pl.Float64 for c in year_cols},
+        )
+        .select(['Country Code'] + year_cols)
+        .unpivot(index='Country Code', variable_name='YEAR', value_name='VALUE')
+        .drop_nulls('VALUE')
+        .select(
+            country_id(),
+            pl.col('YEAR').cast(pl.Int16),
+            pl.col('VALUE'),
+        )
+        .sort('COUNTRY_ID', 'YEAR')
+        .collect()
+    )
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    df_long.write_parquet(out_file)
+    return out_file
+
+def convert_countries(api_files, store_dir=STORE_DIR):
+    ''' all Metadata_Country_ files to one country table '''
+    meta_files = [metadata_path(f) for f in api_files if metadata_path(f).exists()]
+    df_countries = (
+        pl.concat(
+            [
+                pl.scan_csv(f).select(
+                    'Country Code', 'TableName', 'Region', 'IncomeGroup')
+                for f in meta_files
+            ]
+        )
+        .unique('Country Code', keep='first')
+        .select(
+            country_id(),
+            pl.col('Country Code').alias('COUNTRY_CODE'),
+            pl.col('TableName').alias('COUNTRY'),
+            pl.col('Region').alias('REGION'),
+            pl.col('IncomeGroup').alias('INCOME_GROUP'),
+            # World Bank aggregates like 'World' or 'High income' have no region
+            pl.col('Region').is_null().alias('IS_AGGREGATE'),
+        )
+        .sort('COUNTRY_ID')
+        .collect()
+    )
+    out_file = Path(store_dir) / 'countries.parquet'
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    df_countries.write_parquet(out_file)
+    return out_file
+
+def build_store(api_glob=API_GLOB, store_dir=STORE_DIR, max_workers=None):
+    ''' convert all indicator files in parallel, returns list of parquet files '''
+    api_files = sorted(glob.glob(api_glob))
+    # polars releases the GIL while reading and writing, threads are enough
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        out_files = list(pool.map(lambda f: convert_indicator(f, store_dir), api_files))
+    convert_countries(api_files, store_dir)
+    return out_files
+
+#------------------------------------------------------------------------------#
+#     queries                                                                  #
+#------------------------------------------------------------------------------#
+def scan_store(store_dir=STORE_DIR):
+    ''' lazyframe of all indicators, INDICATOR column from the folder names '''
+    return pl.scan_parquet(
+        f'{store_dir}/INDICATOR=*/data.parquet', hive_partitioning=True)
+
+def scan_countries(store_dir=STORE_DIR, include_aggregates=False):
+    ''' lazyframe of the country table '''
+    df_countries = pl.scan_parquet(f'{store_dir}/countries.parquet')
+    if not include_aggregates:
+        df_countries = df_countries.filter(~pl.col('IS_AGGREGATE'))
+    return df_countries
+
+def compare_indicators(code_x, code_y, store_dir=STORE_DIR):
+    ''' one row per country and year with values of both indicators '''
+    df_store = scan_store(store_dir)
+    return (
+        df_store
+        .filter(pl.col('INDICATOR') == code_x)
+        .select('COUNTRY_ID', 'YEAR', pl.col('VALUE').alias(code_x))
+        .join(
+            df_store
+            .filter(pl.col('INDICATOR') == code_y)
+            .select('COUNTRY_ID', 'YEAR', pl.col('VALUE').alias(code_y)),
+            on=['COUNTRY_ID', 'YEAR'],
+            how='inner'
+        )
+        .join(
+            scan_countries(store_dir).select('COUNTRY_ID', 'COUNTRY'),
+            on='COUNTRY_ID',
+            how='inner'
+        )
+        .select('COUNTRY', 'YEAR', code_x, code_y)
+        .sort('COUNTRY', 'YEAR')
+        .collect()
+    )
+
+if __name__ == '__main__':
+    print(build_store())
+    print(
+        scan_store()
+        .group_by('INDICATOR')
+        .agg(pl.len().alias('ROWS'), pl.col('YEAR').max().alias('LATEST_YEAR'))
+        .collect()
+    )
@@ -0,0 +1,175 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'Fig_Fri_Tools'))   # shared tools of all weeks
+from frame_traces import line_figure
+from demand_cube import new_england_states, build_cube, cube_view, cube_hourly
+from downsample import downsample_long
+from population import load_population
+
+# constants
+MAX_POINTS = 1000   # hourly data is downsampled to this many points per state
+
+# population of New England States for data normalization, from the local
+# population.csv table. Run population.py --year 2024 to add newer numbers
+pop = load_population(new_england_states, 2024)
+
+def get_fig(df, x_param, my_custom_data = [], max_points=None,
+            downsample_method='lttb'):
+    ''' line chart of all states, downsampled if max_points is given '''
+    if max_points is not None and len(df) > max_points:
+        # each state keeps its own x values, so plot long data by color
+        df_long = downsample_long(
+            df, x_param, new_england_states, max_points, downsample_method,
+            value_name='DEMAND', custom_cols=my_custom_data,
+        )
+        fig = (
+            line_figure(
+                df_long,
+                x_param,
+                'DEMAND',
+                color='STATE',
+                template='simple_white',
+                height=400, width=800,
+                line_shape='spline',
+                custom_data=my_custom_data,
+            )
+        )
+    else:
+        fig = (
+            line_figure(
+                df,
+                x_param,
+                new_england_states,
+                template='simple_white',
+                height=400, width=800,
+                line_shape='spline',  # I learned this during Fig_Fri_48 Zoom Call,
+                custom_data=my_custom_data
+            )
+        )
+    # only use x_label of x_param is WEEK_NUM, all other are obvious
+    x_label = x_param if x_param=='WEEK_NUM' else ''
+
+    if x_param == 'DATE':
+        fig.update_xaxes(
+            dtick="M1",
+            tickformat="%b\n%Y",
+            ticklabelmode="period")
+    elif x_param == 'HOUR':
+        fig.update_xaxes(
+            dtick="H1",
+            ticklabelmode='period'
+        )
+    elif x_param == 'WEEK_NUM':
+        fig.update_xaxes(
+            dtick='3',
+            ticklabelmode='period'
+        )
+    fig.update_layout(
+        title=(
+            f'2024 New England Electricity Demand by {x_param}'.upper() +
+            '<br><sup>Missing Feb 6 through Feb 17</sup>'
+        ),
+        yaxis_title='KWatt Hours per Resident'.upper(),
+        xaxis_title = x_label,
+        legend_title='STATE',
+    )
+    return fig
+
+#-------------------------------------------------------------------------------
+#   Read data set in one scan: merge Massachusetts zones, normalize by state
+#   population. Views by date, day, hour and week are slices of the cube
+#-------------------------------------------------------------------------------
+cube = build_cube(pop, 'megawatt_demand_2024.csv')
+
+#-------------------------------------------------------------------------------
+#   Plot hourly data, downsampled with LTTB to keep the shape of the curves
+#-------------------------------------------------------------------------------
+fig = get_fig(cube_hourly(cube), 'Local Start Time', max_points=MAX_POINTS)
+fig.show()
+
+#-------------------------------------------------------------------------------
+#   Aggregate by Date, and plot
+#-------------------------------------------------------------------------------
+df_by_date = cube_view(cube, 'DATE')
+fig = get_fig(df_by_date, 'DATE', my_custom_data = ['DATE'])
+fig.add_vrect(
+    x0='2024-06-20',
+    x1='2024-09-22',
+    fillcolor='green',
+    opacity=0.1,
+    line_width=1,
+)
+fig.add_annotation(
+    x=0.75, xref= 'paper',
+    y=1,   yref='paper',
+    showarrow=False,
+    text='<b>Summer</b>',
+)
+fig.show()
+
+#-------------------------------------------------------------------------------
+#   Aggregate & plot by DAY. DAY_NUM of the cube view controls sort order
+#-------------------------------------------------------------------------------
+df_by_day = cube_view(cube, 'DAY')
+fig = get_fig(df_by_day, 'DAY')
+fig.add_vrect(
+    x0=1,
+    x1=5,
+    fillcolor='green',
+    opacity=0.1,
+    line_width=1,
+)
+fig.add_annotation(
+    x=0.5, xref='paper',
+    y=0.1,  yref='paper',
+    showarrow=False,
+    text='<b>Business Days</b>',
+)
+fig.show()
+
+#-------------------------------------------------------------------------------
+#   Aggregate by Hour Number
+#-------------------------------------------------------------------------------
+df_by_hour = cube_view(cube, 'HOUR')
+fig = get_fig(df_by_hour, 'HOUR')
+fig.add_vline(
+    x=12,
+    line_width=1,
+)
+fig.add_annotation(
+    x=11, xref='x',
+    y=1,  yref='paper',
+    showarrow=False,
+    text='A.M.',
+)
+fig.add_annotation(
+    x=13, xref='x',
+    y=1,  yref='paper',
+    showarrow=False,
+    text='P.M.',
+)
+fig.show()
+
+#-------------------------------------------------------------------------------
+#   Aggregate by Week Number, and plot
+#-------------------------------------------------------------------------------
+df_by_week = cube_view(cube, 'WEEK_NUM')
+summer_start = 25  # June 20 is in work_week 25
+summer_end =  38   # Sept 22 is in work_week 38
+
+fig = get_fig(df_by_week, 'WEEK_NUM')
+fig.add_vrect(
+    x0=summer_start,
+    x1=summer_end,
+    fillcolor='green',
+    opacity=0.1,
+    line_width=1,
+)
+fig.add_annotation(
+    x=0.7,  xref='paper',
+    y=0.2,  yref='paper',
+    showarrow=False,
+    text='<b>Summer</b>',
+)
+fig.show()
@@ -0,0 +1,110 @@
+'''
+Benchmark html size and build time of the hourly demand line chart, all
+points versus lttb and minmax downsampling. The 2024 file is repeated 10 times
+(one year after the other) to stand in for the multi-year archive.
+
+First the vectorized lttb of downsample.py is checked against a plain python
+lttb, one state at a time, on the 2024 data: the kept points must be the same.
+'''
+import time
+from datetime import timedelta
+
+import numpy as np
+import polars as pl
+import plotly.express as px
+
+from downsample import bucket_edges, downsample_long, lttb_indices
+
+# constants
+MAX_POINTS = 1000
+YEARS = [1, 10]   # copies of the 2024 file
+states = [
+    'Connecticut', 'Maine', 'New Hampshire', 'Rhode Island', 'Vermont',
+    'Northeast Massachusetts',
+]
+
+df_2024 = (
+    pl.read_csv('megawatt_demand_2024.csv')
+    .select(
+        pl.col('Local Timestamp Eastern Time (Interval Beginning)')
+            .str.to_datetime('%m/%d/%Y %H:%M')
+            .alias('TIME'),
+        *[pl.col(f'{s} Actual Load (MW)').alias(s) for s in states],
+    )
+)
+
+def repeat_years(n_years):
+    ''' n copies of the 2024 data, shifted by 366 days each '''
+    return pl.concat(
+        [
+            df_2024.with_columns(pl.col('TIME') + timedelta(days=366 * i))
+            for i in range(n_years)
+        ]
+    )
+
+def lttb_plain(x, y, n_out):
+    ''' textbook lttb of one series in python loops, list of kept indices '''
+    n = len(x)
+    edges = bucket_edges(n, n_out - 2)
+    kept = [0]
+    for i in range(n_out - 2):
+        if i + 2 < len(edges):
+            next_bucket = range(edges[i + 1], edges[i + 2])
+        else:
+            next_bucket = range(n - 1, n)
+        avg_x = sum(x[j] for j in next_bucket) / len(next_bucket)
+        avg_y = sum(y[j] for j in next_bucket) / len(next_bucket)
+        a = kept[-1]
+        best, best_area = edges[i], -1.0
+        for j in range(edges[i], edges[i + 1]):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+    return kept + [n - 1]
+
+def check_lttb(df):
+    ''' raise if vectorized lttb keeps other points than the plain one '''
+    x = df['TIME'].to_physical().to_numpy().astype(np.float64)
+    Y = df.select(states).to_numpy().astype(np.float64)
+    Y = np.where(np.isnan(Y), np.nanmean(Y, axis=0), Y)   # as lttb_indices does
+    kept = lttb_indices(x, Y, MAX_POINTS)
+    for i, state in enumerate(states):
+        if kept[:, i].tolist() != lttb_plain(x.tolist(), Y[:, i].tolist(), MAX_POINTS):
+            raise AssertionError(f'lttb of {state} differs from the plain python lttb')
+    print(f'lttb matches the plain python lttb for {len(states)} states')
+
+def build_all_points(df):
+    ''' px.line of every hourly point, spline as in get_fig '''
+    return px.line(df, x='TIME', y=states, line_shape='spline')
+
+def build_downsampled(df, method):
+    ''' px.line of lttb or minmax downsampled data '''
+    df_long = downsample_long(df, 'TIME', states, MAX_POINTS, method)
+    return px.line(df_long, x='TIME', y='VALUE', color='STATE', line_shape='spline')
+
+#------------------------------------------------------------------------------#
+#     check lttb, run the benchmark, print a table                             #
+#------------------------------------------------------------------------------#
+check_lttb(df_2024.sort('TIME'))
+rows = []
+for n_years in YEARS:
+    df = repeat_years(n_years)
+    for label, build in [
+            ('all points', build_all_points),
+            ('lttb', lambda d: build_downsampled(d, 'lttb')),
+            ('minmax', lambda d: build_downsampled(d, 'minmax')),
+            ]:
+        start = time.perf_counter()
+        fig = build(df)
+        html = fig.to_html(include_plotlyjs=False, full_html=False)
+        rows.append(
+            {
+                'HOURS'       : len(df),
+                'METHOD'      : label,
+                'POINTS'      : sum(len(t.x) for t in fig.data),
+                'SECONDS'     : round(time.perf_counter() - start, 3),
+                'HTML_KB'     : round(len(html.encode()) / 1024, 1),
+            }
+        )
+print(pl.DataFrame(rows))
@@ -0,0 +1,165 @@
+'''
+Precomputed demand cube for the New England views by date, hour, week and day.
+
+The hourly csv files are read in one lazy scan that merges the 3 Massachusetts zones
+and converts MW per state to KW per resident. The result is stored as numpy
+arrays indexed by (date, hour of day, state): the sum of demand in each cell
+and the number of hourly rows in each cell. Two rows share a cell on the day
+that daylight saving time ends, and no row fills the hour skipped in spring.
+
+Every view of get_fig is a reduction of these arrays, no group_by on the
+hourly data, and new hourly rows are added in place with update_cube. The
+cube keeps the hours it holds, rows of an hour already in it are skipped, so
+reading a file again does not count it twice. Both rows of the fall-back hour
+are kept when they come in the same update, as they do from one file.
+'''
+import numpy as np
+import polars as pl
+
+from demand_files import TIME_COL, scan_demand
+
+# constants
+new_england_states = [
+    'Connecticut','Maine', 'Massachusetts',
+    'New Hampshire',  'Rhode Island','Vermont',
+]
+csv_source = 'megawatt_demand_2024.csv'   # or a glob like megawatt_demand_*.csv
+DAY_NAMES = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
+
+#------------------------------------------------------------------------------#
+#     hourly data, one lazy scan                                               #
+#------------------------------------------------------------------------------#
+def scan_hourly(df_lazy, pop):
+    ''' hourly KW per resident by state, df_lazy from scan_demand '''
+    return (
+        df_lazy
+        .select(
+            pl.col(TIME_COL).alias('Local Start Time'),
+            # merge 3 regions of Massachusetts for statewide data
+            Massachusetts = (
+                pl.col('Northeast Massachusetts Actual Load (MW)') +
+                pl.col('Southeast Massachusetts Actual Load (MW)') +
+                pl.col('Western/Central Massachusetts Actual Load (MW)')
+            ),
+            *[
+                pl.col(f'{state} Actual Load (MW)').alias(state)
+                for state in new_england_states if state != 'Massachusetts'
+            ],
+        )
+        # divide by population, multiply by 1000 to change MW to KW
+        .with_columns(
+            [pl.col(state) * 1000 / pop[state] for state in new_england_states]
+        )
+    )
+
+#------------------------------------------------------------------------------#
+#     build and update                                                         #
+#------------------------------------------------------------------------------#
+def empty_cube(first_date, last_date):
+    ''' cube with all-zero arrays for dates first_date to last_date '''
+    dates = np.arange(first_date, last_date + np.timedelta64(1, 'D'),
+                      dtype='datetime64[D]')
+    return {
+        'dates': dates,
+        'states': list(new_england_states),
+        'sum': np.zeros((len(dates), 24, len(new_england_states))),
+        'count': np.zeros((len(dates), 24), dtype=np.int32),
+        'hours': np.array([], dtype='datetime64[h]'),   # sorted hours added
+    }
+
+def update_cube(cube, df_hourly):
+    ''' add rows of new hours to the cube, dates are extended if needed '''
+    times = df_hourly['Local Start Time'].to_numpy().astype('datetime64[h]')
+    if cube is not None:   # hours already added are not counted again
+        new_rows = ~np.isin(times, cube['hours'])
+        times, df_hourly = times[new_rows], df_hourly.filter(new_rows)
+        if not len(times):
+            return cube
+    days = times.astype('datetime64[D]')
+    first, last = days.min(), days.max()
+    if cube is None:
+        cube = empty_cube(first, last)
+
+    # extend date axis at either end, existing cells keep their values
+    pad_before = max(int((cube['dates'][0] - first).astype(int)), 0)
+    pad_after = max(int((last - cube['dates'][-1]).astype(int)), 0)
+    if pad_before or pad_after:
+        new_cube = empty_cube(min(first, cube['dates'][0]),
+                              max(last, cube['dates'][-1]))
+        stop = pad_before + len(cube['dates'])
+        new_cube['sum'][pad_before:stop] = cube['sum']
+        new_cube['count'][pad_before:stop] = cube['count']
+        new_cube['hours'] = cube['hours']
+        cube = new_cube
+
+    d = (days - cube['dates'][0]).astype(np.int64)
+    h = (times - days).astype(np.int64)
+    values = df_hourly.select(cube['states']).to_numpy()
+    np.add.at(cube['sum'], (d, h), values)
+    np.add.at(cube['count'], (d, h), 1)
+    cube['hours'] = np.union1d(cube['hours'], times)
+    return cube
+
+def build_cube(pop, source=csv_source):
+    ''' read the hourly csv files in one scan, return the cube '''
+    df_hourly = scan_hourly(scan_demand(source), pop).collect()
+    return update_cube(None, df_hourly)
+
+#------------------------------------------------------------------------------#
+#     views                                                                    #
+#------------------------------------------------------------------------------#
+def view_frame(cube, x_name, x_values, z):
+    ''' dataframe with x column and one column per state '''
+    return pl.DataFrame(
+        {x_name: x_values} |
+        {state: z[:, i] for i, state in enumerate(cube['states'])}
+    )
+
+def cube_view(cube, x_param):
+    ''' dataframe for get_fig, x_param is DATE, DAY, HOUR or WEEK_NUM '''
+    day_sum = cube['sum'].sum(axis=1)                     # (date, state)
+    has_data = cube['count'].sum(axis=1) > 0              # dates in the data
+
+    if x_param == 'DATE':
+        return view_frame(cube, 'DATE', cube['dates'][has_data], day_sum[has_data])
+
+    if x_param == 'HOUR':   # mean over all rows of each hour of the day
+        hour_sum = cube['sum'].sum(axis=0)
+        hour_count = cube['count'].sum(axis=0)
+        return view_frame(
+            cube, 'HOUR', np.arange(24, dtype=np.int8),
+            hour_sum / hour_count[:, None])
+
+    if x_param == 'WEEK_NUM':   # iso week of each date
+        weeks = (
+            pl.Series(cube['dates'][has_data]).dt.week().to_numpy()
+        )
+        week_nums = np.unique(weeks)
+        z = np.zeros((len(week_nums), len(cube['states'])))
+        np.add.at(z, np.searchsorted(week_nums, weeks), day_sum[has_data])
+        return view_frame(cube, 'WEEK_NUM', week_nums.astype(np.int8), z)
+
+    if x_param == 'DAY':    # average of each weekday over 52 weeks
+        # 1970-01-01 was a Thursday, day 4 when Sunday is day 0
+        day_nums = ((cube['dates'].astype(np.int64) + 4) % 7)[has_data]
+        z = np.zeros((7, len(cube['states'])))
+        np.add.at(z, day_nums, day_sum[has_data])
+        return (
+            view_frame(cube, 'DAY_NUM', np.arange(7, dtype=np.int8), z / 52)
+            .with_columns(DAY = pl.Series(DAY_NAMES))
+        )
+
+    raise ValueError(f'unknown view {x_param}, use DATE, DAY, HOUR or WEEK_NUM')
+
+def cube_hourly(cube):
+    ''' hourly mean back from the cube, for the downsampled hourly chart '''
+    filled = cube['count'] > 0
+    day_idx, hour_idx = np.nonzero(filled)
+    times = (
+        cube['dates'][day_idx].astype('datetime64[h]') +
+        hour_idx.astype('timedelta64[h]')
+    ).astype('datetime64[ms]')   # polars has no hour resolution
+    # the fall-back hour has 2 rows, the mean like the other views
+    return view_frame(
+        cube, 'Local Start Time', times,
+        cube['sum'][filled] / cube['count'][filled][:, None])
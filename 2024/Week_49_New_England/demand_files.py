@@ -0,0 +1,42 @@
+'''
+Lazy loader for any number of yearly ISO-NE demand files, megawatt_demand_*.csv.
+
+All files matching the glob are scanned as one dataset. Of the 3 timestamp
+columns only the local interval beginning is parsed, with an explicit format,
+and the 8 load columns are read as Float32, as declared in dataset_schemas.py,
+so nothing is inferred and the unused columns are never parsed. Queries over many years run on the polars
+streaming engine, in batches, so memory stays bounded.
+'''
+import polars as pl
+
+from dataset_schemas import datasets, scan_dataset   # Fig_Fri_Tools, on sys.path of the caller
+
+# constants
+csv_glob = 'megawatt_demand_*.csv'
+TIME_COL = 'Local Timestamp Eastern Time (Interval Beginning)'
+TIME_FORMAT = '%m/%d/%Y %H:%M'
+load_cols = list(datasets['demand']['schema'])
+
+def scan_demand(source=csv_glob):
+    ''' lazyframe of all matching files, local start time + load columns '''
+    return (
+        scan_dataset('demand', source)   # TIME_COL is a string until parsed here
+        .select(
+            pl.col(TIME_COL).str.to_datetime(TIME_FORMAT),
+            pl.col(load_cols),
+        )
+    )
+
+def demand_by_year_month(source=csv_glob):
+    ''' total MWh of each zone by year and month, one streaming query '''
+    return (
+        scan_demand(source)
+        .group_by(
+            YEAR = pl.col(TIME_COL).dt.year(),
+            MONTH = pl.col(TIME_COL).dt.month(),
+        )
+        # Float32 is fine to read, but sum thousands of hours in Float64
+        .agg(pl.col(load_cols).cast(pl.Float64).sum())
+        .sort('YEAR', 'MONTH')
+        .collect(engine='streaming')
+    )
@@ -0,0 +1,107 @@
+'''
+Downsampling of long time series for line charts, all states at once.
+
+lttb: Largest-Triangle-Three-Buckets. The series is split into buckets, and
+from each bucket the point is kept that makes the largest triangle with the
+point kept from the previous bucket and the average of the next bucket. This
+keeps peaks and the overall shape with far fewer points. The buckets must be
+done in order, but each bucket is one numpy step for every state together.
+
+minmax: keeps the lowest and highest point of each bucket, fully vectorized.
+Good for very spiky data, gives 2 points per bucket.
+
+Each state keeps different x values, so the result is a long dataframe with
+columns x, STATE and the value column, ready for px.line(..., color='STATE').
+Columns in custom_cols come along with the rows kept, for hover custom_data.
+'''
+import numpy as np
+import polars as pl
+
+# constants
+DEFAULT_POINTS = 1000   # points per state after downsampling
+
+def bucket_edges(n, n_buckets):
+    ''' start index of each bucket of the points between first and last '''
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+
+def lttb_indices(x, Y, n_out):
+    ''' indices kept by lttb, shape (n_out, states), x shared by all states '''
+    n, n_states = Y.shape
+    if n_out >= n or n_out < 3:
+        return np.repeat(np.arange(n)[:, None], n_states, axis=1)
+
+    # first and last points are always kept, the others go in n_out - 2 buckets
+    edges = bucket_edges(n, n_out - 2)
+    Y = np.where(np.isnan(Y), np.nanmean(Y, axis=0), Y)  # gaps don't win
+
+    # average of every bucket, for all states in one reduceat
+    counts = np.diff(np.r_[edges[:-1], n - 1])
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_Y = np.add.reduceat(Y[:n - 1], edges[:-1], axis=0) / counts[:, None]
+    # next-bucket average of the last bucket is the last point
+    avg_x = np.r_[avg_x[1:], x[-1]]
+    avg_Y = np.vstack([avg_Y[1:], Y[-1]])
+
+    kept = np.empty((n_out, n_states), dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    cols = np.arange(n_states)
+    a = np.zeros(n_states, dtype=np.int64)   # point kept from previous bucket
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        x_a, y_a = x[a], Y[a, cols]
+        # twice the triangle area, for each point in bucket and each state
+        area = np.abs(
+            (x_a - avg_x[i]) * (Y[lo:hi] - y_a)
+            - (x_a - x[lo:hi, None]) * (avg_Y[i] - y_a)
+        )
+        a = lo + np.argmax(area, axis=0)
+        kept[i + 1] = a
+    return kept
+
+def minmax_indices(Y, n_out):
+    ''' indices of min and max of each bucket, shape (n_out, states) '''
+    n, n_states = Y.shape
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.repeat(np.arange(n)[:, None], n_states, axis=1)
+    size = int(np.ceil(n / n_buckets))
+    pad = size * n_buckets - n
+    Y_pad = np.vstack([Y, np.full((pad, n_states), np.nan)])
+    Y_pad = np.where(np.isnan(Y_pad), np.nanmean(Y, axis=0), Y_pad)
+    buckets = Y_pad.reshape(n_buckets, size, n_states)
+    start = (np.arange(n_buckets) * size)[:, None]
+    i_min = start + np.argmin(buckets, axis=1)
+    i_max = start + np.argmax(buckets, axis=1)
+    # keep time order of each min/max pair, and stay inside the real data
+    kept = np.sort(np.stack([i_min, i_max], axis=1), axis=1)
+    return np.minimum(kept.reshape(-1, n_states), n - 1)
+
+def downsample_long(df, x_col, y_cols, n_out=DEFAULT_POINTS, method='lttb',
+                    value_name='VALUE', custom_cols=()):
+    ''' downsampled long dataframe, x_col, STATE, value_name and custom_cols '''
+    df = df.sort(x_col)
+    x_series = df[x_col]
+    # datetimes as integers for the triangle areas, original values are kept
+    x = x_series.to_physical().to_numpy().astype(np.float64)
+    Y = df.select(y_cols).to_numpy().astype(np.float64)
+
+    if method == 'lttb':
+        kept = lttb_indices(x, Y, n_out)
+    elif method == 'minmax':
+        kept = minmax_indices(Y, n_out)
+    else:
+        raise ValueError(f'unknown downsample method {method}, use lttb or minmax')
+
+    kept_flat = kept.T.ravel()   # state by state
+    custom_cols = [c for c in custom_cols if c not in (x_col, 'STATE', value_name)]
+    df_long = pl.DataFrame(
+        {
+            x_col: x_series.gather(kept_flat),
+            'STATE': np.repeat(y_cols, kept.shape[0]),
+            value_name: Y[kept_flat, np.repeat(np.arange(len(y_cols)), kept.shape[0])],
+        }
+    )
+    if custom_cols:
+        df_long = df_long.with_columns(df.select(custom_cols)[kept_flat])
+    return df_long
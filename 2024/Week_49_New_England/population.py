@@ -0,0 +1,89 @@
+'''
+Local population table for per-capita normalization, no web request per run.
+
+population.csv has one row per region (state or country) and year, with the
+source of each number, and is versioned in git with the code. load_population
+returns the population of the latest year on file up to the requested year.
+
+To add a year from a web table, like worldpopulationreview.com/states, run
+
+    python population.py --year 2025
+    python population.py --year 2025 --url http://localhost:8000/states.html
+
+The second form reads a saved copy of the page from a local server, useful
+offline or for testing. Rows of the same region, year and source are replaced.
+'''
+import argparse
+from datetime import date
+
+import polars as pl
+
+# constants
+POP_CSV = 'population.csv'
+POP_URL = 'https://worldpopulationreview.com/states'
+POP_SCHEMA = {
+    'REGION' : pl.String,
+    'YEAR'   : pl.Int16,
+    'POP'    : pl.Int64,
+    'SOURCE' : pl.String,
+}
+
+def read_population(path=POP_CSV):
+    ''' the whole population table '''
+    return pl.read_csv(path, schema=POP_SCHEMA)
+
+def load_population(regions, year, path=POP_CSV):
+    ''' dict of region: population, latest year on file up to year '''
+    df_pop = (
+        read_population(path)
+        .filter(pl.col('REGION').is_in(regions), pl.col('YEAR') <= year)
+        .sort('YEAR')
+        .group_by('REGION')
+        .last()
+    )
+    missing = set(regions) - set(df_pop['REGION'])
+    if missing:
+        raise ValueError(f'no population up to {year} in {path} for {sorted(missing)}')
+    return dict(zip(df_pop['REGION'], df_pop['POP']))
+
+def refresh_population(year, url=POP_URL, path=POP_CSV):
+    ''' add population of year from a web table, returns the new table '''
+    import pandas as pd   # only needed for read_html
+
+    df_web = (
+        pl.from_pandas(pd.read_html(url)[0])
+        .select(
+            pl.col('State').alias('REGION'),
+            pl.lit(year).cast(pl.Int16).alias('YEAR'),
+            pl.col(f'{year} Pop.').cast(pl.Int64).alias('POP'),
+            pl.lit(f'{url} retrieved {date.today()}').alias('SOURCE'),
+        )
+    )
+    # replace rows from an earlier refresh of the same year and url
+    source_prefix = f'{url} retrieved '
+    df_pop = (
+        pl.concat(
+            [
+                read_population(path).filter(
+                    ~(
+                        (pl.col('YEAR') == year)
+                        & pl.col('SOURCE').str.starts_with(source_prefix)
+                        & pl.col('REGION').is_in(df_web['REGION'].implode())
+                    )
+                ),
+                df_web,
+            ]
+        )
+        .sort('YEAR', 'REGION')
+    )
+    df_pop.write_csv(path)
+    return df_pop
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='add a year to population.csv')
+    parser.add_argument('--year', type=int, required=True)
+    parser.add_argument('--url', default=POP_URL)
+    parser.add_argument('--path', default=POP_CSV)
+    args = parser.parse_args()
+    df = refresh_population(args.year, args.url, args.path)
+    print(df.filter(pl.col('YEAR') == args.year))